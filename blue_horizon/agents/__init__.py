@@ -1,4 +1,22 @@
-from .base_agent import BaseConciergAgent
-from .weather_agent import WeatherAgent
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base_agent import BaseConciergAgent
+    from .weather_agent import WeatherAgent
 
 __all__ = ['BaseConciergAgent', 'WeatherAgent']
+
+# Agents subclass autogen classes, so import them on first access only. This
+# keeps lightweight modules such as ``definitions`` free of the autogen import.
+_LAZY_IMPORTS = {
+    'BaseConciergAgent': '.base_agent',
+    'WeatherAgent': '.weather_agent',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+
+        return getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
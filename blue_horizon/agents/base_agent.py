@@ -1,6 +1,73 @@
-from typing import Dict, Any, Optional, List, Union
+import asyncio
+import re
+import string
+import sys
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, Optional, List, Tuple, Union
 from autogen import ConversableAgent
-from blue_horizon.agents.config import OPENAI_CONFIG
+from blue_horizon.agents.config import CONVERSATION_CONFIGS, OPENAI_CONFIG
+
+_MEMORY_TOKEN_RE = re.compile(r"[a-z]{2,}")
+_CACHE_KEY_RE = re.compile(r"[a-z0-9]+")
+
+# Maximum number of normalized messages with cached responses per agent
+_RESPONSE_CACHE_SIZE = 128
+
+# Seconds a cached response is reused before the LLM is asked again, so
+# time-sensitive answers (weather, availability) don't go stale
+_RESPONSE_CACHE_TTL = 300.0
+
+_NO_RESPONSE_MESSAGE = "I apologize, but I couldn't generate a response."
+
+
+def _memory_tokens(text: str) -> FrozenSet[str]:
+    """Get the set of words used to match memories against a query."""
+    return frozenset(_MEMORY_TOKEN_RE.findall(text.lower()))
+
+
+def _response_cache_key(text: str) -> Tuple[str, ...]:
+    """Normalize a message, ignoring case, punctuation and spacing."""
+    return tuple(_CACHE_KEY_RE.findall(text.lower()))
+
+
+# Guidance shared by every agent. It leads the system prompt so all agents
+# share one cacheable prefix; agent-specific text follows it.
+_GLOBAL_PREAMBLE = sys.intern(
+    f"""{CONVERSATION_CONFIGS["system_message"]}
+
+        Always maintain a professional and helpful demeanor while interacting with guests and other agents.
+        Focus on your specific role while coordinating with other agents when needed.
+
+        """
+)
+
+_SYSTEM_MESSAGE_TEMPLATE = string.Template(
+    sys.intern(
+        """You are $name, an agent in the Blue Horizon AI Concierge system.
+        
+        Role Description:
+        $description
+        
+        Instructions:
+        $instructions
+        """
+    )
+)
+
+
+@lru_cache(maxsize=32)
+def _build_system_message(name: str, description: str, instructions: str) -> str:
+    """Build the static system prompt for an agent.
+
+    The prompt only depends on the agent's configuration, so identical agents
+    share the exact same string and provider-side prompt caches can hit on
+    every call. Dynamic content (memory, user turn) belongs in the user message.
+    """
+    return _GLOBAL_PREAMBLE + _SYSTEM_MESSAGE_TEMPLATE.substitute(
+        name=name, description=description, instructions=instructions
+    )
 
 
 class BaseConciergAgent(ConversableAgent):
@@ -22,45 +89,50 @@ class BaseConciergAgent(ConversableAgent):
         if llm_config is None:
             llm_config = OPENAI_CONFIG
 
-        system_message = f"""You are {name}, an agent in the Blue Horizon AI Concierge system.
-        
-        Role Description:
-        {description}
-        
-        Instructions:
-        {instructions}
-        
-        Always maintain a professional and helpful demeanor while interacting with guests and other agents.
-        Focus on your specific role while coordinating with other agents when needed.
-        """
+        system_message = _build_system_message(name, description, instructions)
 
         super().__init__(
             name=name, system_message=system_message, llm_config=llm_config, **kwargs
         )
 
-        # Initialize conversation memory
-        self.conversation_memory = []
+        # Initialize conversation memory, keeping only the last 10 interactions
+        # to prevent memory bloat
+        self.conversation_memory = deque(maxlen=10)
+
+        # Responses to previously answered messages with their expiry times,
+        # least recently used first
+        self._response_cache: "OrderedDict[Tuple[str, ...], Tuple[str, float]]" = (
+            OrderedDict()
+        )
+
+    def reset(self):
+        """Reset the agent, also forgetting past interactions and responses."""
+        super().reset()
+        self.conversation_memory.clear()
+        self._response_cache.clear()
 
     def remember_interaction(
         self, message: str, response: str, metadata: Optional[Dict] = None
     ):
         """Store an interaction in the agent's memory."""
         self.conversation_memory.append(
-            {"message": message, "response": response, "metadata": metadata or {}}
+            {
+                "message": message,
+                "response": response,
+                "metadata": metadata or {},
+                "tokens": _memory_tokens(message),
+            }
         )
 
-        # Keep only last 10 interactions to prevent memory bloat
-        if len(self.conversation_memory) > 10:
-            self.conversation_memory = self.conversation_memory[-10:]
-
     def get_relevant_memory(self, query: str) -> List[Dict]:
         """Get relevant past interactions based on a query."""
-        # Simple relevance matching - could be enhanced with embeddings
-        relevant = []
-        for memory in self.conversation_memory:
-            if any(word in memory["message"].lower() for word in query.lower().split()):
-                relevant.append(memory)
-        return relevant
+        # Simple word-overlap matching - could be enhanced with embeddings
+        query_tokens = _memory_tokens(query)
+        return [
+            memory
+            for memory in self.conversation_memory
+            if memory["tokens"] & query_tokens
+        ]
 
     async def _process_message(
         self, message: Union[str, Dict], sender: Optional[Any] = None
@@ -73,8 +145,20 @@ class BaseConciergAgent(ConversableAgent):
             # Get relevant past interactions
             relevant_memory = self.get_relevant_memory(message_text)
 
+            # The response depends on the conversation when past interactions
+            # are relevant, so only standalone messages use the cache
+            cache_key = None if relevant_memory else _response_cache_key(message_text)
+
+            # Reuse the answer to an equivalent message without calling the LLM
+            cached = self._get_cached_response(cache_key) if cache_key else None
+            if cached is not None:
+                self.remember_interaction(message_text, cached, {"cached": True})
+                return cached
+
             # Generate response using the LLM
             response = await self.generate_response(message_text, relevant_memory)
+            if cache_key and response != _NO_RESPONSE_MESSAGE:
+                self._cache_response(cache_key, response)
 
             # Store the interaction
             self.remember_interaction(message_text, response)
@@ -86,6 +170,50 @@ class BaseConciergAgent(ConversableAgent):
             self.remember_interaction(str(message), error_msg, {"error": str(e)})
             return error_msg
 
+    def _get_cached_response(self, cache_key: Tuple[str, ...]) -> Optional[str]:
+        """Get an unexpired cached response, dropping it if it has expired."""
+        entry = self._response_cache.get(cache_key)
+        if entry is None:
+            return None
+
+        response, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._response_cache[cache_key]
+            return None
+
+        self._response_cache.move_to_end(cache_key)
+        return response
+
+    def _cache_response(self, cache_key: Tuple[str, ...], response: str):
+        """Cache a response, evicting the least recently used entry if full."""
+        self._response_cache[cache_key] = (
+            response,
+            time.monotonic() + _RESPONSE_CACHE_TTL,
+        )
+        self._response_cache.move_to_end(cache_key)
+        if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    @classmethod
+    async def generate_responses_batch(
+        cls, agents: List["BaseConciergAgent"], messages: List[str]
+    ) -> List[str]:
+        """Process one message per agent concurrently.
+
+        Args:
+            agents: Agents to query
+            messages: Message for each agent, in the same order as agents
+
+        Returns:
+            List[str]: Responses in the same order as the agents
+        """
+        # Pair everything up first so a length mismatch raises before any
+        # coroutine is created
+        pairs = list(zip(agents, messages, strict=True))
+        return await asyncio.gather(
+            *(agent._process_message(message) for agent, message in pairs)
+        )
+
     async def generate_response(self, message: str, context: List[Dict]) -> str:
         """Generate a response to a message using the agent's LLM.
 
@@ -96,23 +224,23 @@ class BaseConciergAgent(ConversableAgent):
         Returns:
             str: The generated response
         """
-        # Format context into a string
-        context_str = ""
+        # Combine message with context, joining the parts once
+        full_message = message
         if context:
-            context_str = "\nRelevant past interactions:\n"
+            parts = [message, "\n\nRelevant past interactions:\n"]
             for interaction in context:
-                context_str += f"User: {interaction['message']}\n"
-                context_str += f"Response: {interaction['response']}\n"
+                parts.append(f"User: {interaction['message']}\n")
+                parts.append(f"Response: {interaction['response']}\n")
+            full_message = "".join(parts)
 
-        # Combine message with context
-        full_message = f"{message}\n{context_str}" if context_str else message
-
-        # Use the built-in reply functionality of ConversableAgent
-        async for response in self.generate_reply(
+        # Use the built-in async reply functionality of ConversableAgent
+        response = await self.a_generate_reply(
             messages=[{"role": "user", "content": full_message}],
             sender=None,
-        ):
-            if response:
-                return response
+        )
+        if isinstance(response, dict):
+            response = response.get("content")
+        if response:
+            return response
 
-        return "I apologize, but I couldn't generate a response."
+        return _NO_RESPONSE_MESSAGE
@@ -1,10 +1,23 @@
 """Booking agent for handling all types of reservations."""
 
-from typing import Dict, Any, Optional, List
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List
 from datetime import datetime
 
 from blue_horizon.agents.base_agent import BaseConciergAgent
 from blue_horizon.agents.definitions import BOOKING_AGENT
+from blue_horizon.agents.keyword_classifier import KeywordClassifier
+
+# Booking type keywords, in order of precedence
+_BOOKING_TYPE_CLASSIFIER = KeywordClassifier(
+    {
+        "room": ["room", "suite", "accommodation"],
+        "restaurant": ["restaurant", "dining", "dinner", "lunch"],
+        "event": ["event", "conference", "meeting"],
+        "service": ["service", "spa", "massage"],
+    },
+    default="unknown",
+)
 
 
 class BookingAgent(BaseConciergAgent):
@@ -30,18 +43,23 @@ class BookingAgent(BaseConciergAgent):
             **kwargs
         )
 
-    def get_capabilities(self) -> Dict[str, Any]:
+        # Capabilities are fixed per agent, so build them once
+        self._capabilities = MappingProxyType(
+            {
+                "name": self.agent_name,
+                "description": self.description,
+                "can_handle": (
+                    "room_bookings",
+                    "restaurant_reservations",
+                    "event_bookings",
+                    "service_appointments",
+                ),
+            }
+        )
+
+    def get_capabilities(self) -> Mapping[str, Any]:
         """Get the booking agent's capabilities."""
-        return {
-            "name": self.agent_name,
-            "description": self.description,
-            "can_handle": [
-                "room_bookings",
-                "restaurant_reservations",
-                "event_bookings",
-                "service_appointments",
-            ],
-        }
+        return self._capabilities
 
     def handle_request(
         self, request: str, context: Optional[Dict[str, Any]] = None
@@ -63,18 +81,7 @@ class BookingAgent(BaseConciergAgent):
 
     def _determine_booking_type(self, request: str) -> str:
         """Determine the type of booking from the request."""
-        request = request.lower()
-        if any(word in request for word in ["room", "suite", "accommodation"]):
-            return "room"
-        elif any(
-            word in request for word in ["restaurant", "dining", "dinner", "lunch"]
-        ):
-            return "restaurant"
-        elif any(word in request for word in ["event", "conference", "meeting"]):
-            return "event"
-        elif any(word in request for word in ["service", "spa", "massage"]):
-            return "service"
-        return "unknown"
+        return _BOOKING_TYPE_CLASSIFIER.classify(request)
 
     def _handle_room_booking(
         self, request: str, context: Optional[Dict[str, Any]] = None
@@ -1,16 +1,35 @@
 from typing import Dict, Any
 import os
+import httpx
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv(override=True)
 
+
+class _SharedHTTPClient(httpx.Client):
+    """HTTP client shared by every agent's OpenAI client.
+
+    autogen deep-copies llm_config for each agent; returning the same instance
+    keeps one connection pool for the whole process instead of one per agent.
+    """
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+SHARED_HTTP_CLIENT = _SharedHTTPClient(
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=100),
+    timeout=60,
+)
+
 # OpenAI API configuration
 OPENAI_CONFIG = {
     "api_key": os.getenv("OPENAI_API_KEY"),
     "model": "gpt-4-turbo-preview",  # Default model
     "temperature": 0.7,
-    "max_tokens": 1000
+    "max_tokens": 1000,
+    "http_client": SHARED_HTTP_CLIENT,
 }
 
 # Agent configurations
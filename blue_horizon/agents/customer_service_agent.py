@@ -1,10 +1,23 @@
 """Customer service agent for handling inquiries and feedback."""
 
-from typing import Dict, Any, Optional, List
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List
 from datetime import datetime
 
 from blue_horizon.agents.base_agent import BaseConciergAgent
 from blue_horizon.agents.definitions import CUSTOMER_SERVICE_AGENT
+from blue_horizon.agents.keyword_classifier import KeywordClassifier
+
+# Request type keywords, in order of precedence
+_REQUEST_TYPE_CLASSIFIER = KeywordClassifier(
+    {
+        "inquiry": ["how", "what", "when", "where", "who", "which"],
+        "feedback": ["feedback", "suggest", "review", "rating"],
+        "complaint": ["complaint", "problem", "issue", "unhappy", "dissatisfied"],
+        "faq": ["faq", "question", "help", "explain"],
+    },
+    default="general",
+)
 
 
 class CustomerServiceAgent(BaseConciergAgent):
@@ -31,19 +44,24 @@ class CustomerServiceAgent(BaseConciergAgent):
             **kwargs
         )
 
-    def get_capabilities(self) -> Dict[str, Any]:
+        # Capabilities are fixed per agent, so build them once
+        self._capabilities = MappingProxyType(
+            {
+                "name": self.agent_name,
+                "description": self.description,
+                "can_handle": (
+                    "customer_inquiries",
+                    "feedback_processing",
+                    "complaint_resolution",
+                    "faq_responses",
+                    "service_recovery",
+                ),
+            }
+        )
+
+    def get_capabilities(self) -> Mapping[str, Any]:
         """Get the customer service agent's capabilities."""
-        return {
-            "name": self.agent_name,
-            "description": self.description,
-            "can_handle": [
-                "customer_inquiries",
-                "feedback_processing",
-                "complaint_resolution",
-                "faq_responses",
-                "service_recovery",
-            ],
-        }
+        return self._capabilities
 
     def handle_request(
         self, request: str, context: Optional[Dict[str, Any]] = None
@@ -64,23 +82,7 @@ class CustomerServiceAgent(BaseConciergAgent):
 
     def _determine_request_type(self, request: str) -> str:
         """Determine the type of customer service request."""
-        request = request.lower()
-        if any(
-            word in request for word in ["how", "what", "when", "where", "who", "which"]
-        ):
-            return "inquiry"
-        elif any(
-            word in request for word in ["feedback", "suggest", "review", "rating"]
-        ):
-            return "feedback"
-        elif any(
-            word in request
-            for word in ["complaint", "problem", "issue", "unhappy", "dissatisfied"]
-        ):
-            return "complaint"
-        elif any(word in request for word in ["faq", "question", "help", "explain"]):
-            return "faq"
-        return "general"
+        return _REQUEST_TYPE_CLASSIFIER.classify(request)
 
     def _handle_inquiry(
         self, request: str, context: Optional[Dict[str, Any]] = None
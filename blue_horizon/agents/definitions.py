@@ -4,7 +4,7 @@ This module defines all agents used in the system, including their roles,
 responsibilities, and configurations.
 """
 
-from typing import Dict, List
+from typing import Dict, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -23,7 +23,7 @@ class AgentRole(Enum):
     ORCHESTRATOR = "orchestrator"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AgentConfig:
     """Configuration for an individual agent."""
 
@@ -31,32 +31,45 @@ class AgentConfig:
     name: str
     description: str
     llm_config: Dict
-    tools: List[str]
+    tools: Tuple[str, ...]
     human_input_mode: str = "NEVER"
     max_consecutive_auto_reply: int = 10
 
 
+# Shared LLM settings. These stay plain dicts because autogen requires a dict
+# llm_config and deep-copies it per agent.
+_SYSTEM_LLM_CONFIG = {
+    "temperature": 0.7,
+    "request_timeout": 120,
+}
+
+# Lower temperature for more precise handling of bookings and resources
+_PRECISE_LLM_CONFIG = {
+    "temperature": 0.3,
+    "request_timeout": 60,
+}
+
+# Higher temperature for more natural conversation
+_CONVERSATIONAL_LLM_CONFIG = {
+    "temperature": 0.7,
+    "request_timeout": 60,
+}
+
 # System-level agents
 USER_PROXY = AgentConfig(
     role=AgentRole.USER_PROXY,
     name="UserProxy",
     description="Interface between human users and the agent system. Handles all direct user interactions.",
-    llm_config={
-        "temperature": 0.7,
-        "request_timeout": 120,
-    },
-    tools=["user_input", "user_output"],
+    llm_config=_SYSTEM_LLM_CONFIG,
+    tools=("user_input", "user_output"),
 )
 
 GROUP_CHAT_MANAGER = AgentConfig(
     role=AgentRole.GROUP_MANAGER,
     name="GroupChatManager",
     description="Manages and coordinates conversations between multiple agents, ensuring proper flow of information.",
-    llm_config={
-        "temperature": 0.7,
-        "request_timeout": 120,
-    },
-    tools=["message_routing", "conversation_management"],
+    llm_config=_SYSTEM_LLM_CONFIG,
+    tools=("message_routing", "conversation_management"),
 )
 
 # Specialized agents
@@ -64,76 +77,61 @@ BOOKING_AGENT = AgentConfig(
     role=AgentRole.BOOKING,
     name="BookingAgent",
     description="Handles all types of reservations including rooms, restaurants, events, and services.",
-    llm_config={
-        "temperature": 0.3,  # Lower temperature for more precise booking handling
-        "request_timeout": 60,
-    },
-    tools=[
+    llm_config=_PRECISE_LLM_CONFIG,
+    tools=(
         "room_booking",
         "restaurant_booking",
         "event_booking",
         "service_appointment",
-    ],
+    ),
 )
 
 CUSTOMER_SERVICE_AGENT = AgentConfig(
     role=AgentRole.CUSTOMER_SERVICE,
     name="CustomerServiceAgent",
     description="Manages customer inquiries, feedback, and FAQ responses.",
-    llm_config={
-        "temperature": 0.7,  # Higher temperature for more natural conversation
-        "request_timeout": 60,
-    },
-    tools=[
+    llm_config=_CONVERSATIONAL_LLM_CONFIG,
+    tools=(
         "customer_info",
         "feedback_management",
         "faq_lookup",
-    ],
+    ),
 )
 
 FACILITIES_AGENT = AgentConfig(
     role=AgentRole.FACILITIES,
     name="FacilitiesAgent",
     description="Manages room and facility availability, amenity access, and space allocation.",
-    llm_config={
-        "temperature": 0.3,
-        "request_timeout": 60,
-    },
-    tools=[
+    llm_config=_PRECISE_LLM_CONFIG,
+    tools=(
         "room_management",
         "amenity_management",
         "space_management",
-    ],
+    ),
 )
 
 CONCIERGE_AGENT = AgentConfig(
     role=AgentRole.CONCIERGE,
     name="ConciergeAgent",
     description="Provides personalized recommendations and handles special requests.",
-    llm_config={
-        "temperature": 0.7,
-        "request_timeout": 60,
-    },
-    tools=[
+    llm_config=_CONVERSATIONAL_LLM_CONFIG,
+    tools=(
         "recommendation_lookup",
         "service_lookup",
         "promotion_lookup",
-    ],
+    ),
 )
 
 STAFF_COORDINATOR_AGENT = AgentConfig(
     role=AgentRole.STAFF_COORDINATOR,
     name="StaffCoordinatorAgent",
     description="Manages staff assignments, scheduling, and coordination.",
-    llm_config={
-        "temperature": 0.3,
-        "request_timeout": 60,
-    },
-    tools=[
+    llm_config=_PRECISE_LLM_CONFIG,
+    tools=(
         "staff_management",
         "schedule_management",
         "event_tracking",
-    ],
+    ),
 )
 
 ANALYTICS_AGENT = AgentConfig(
@@ -144,11 +142,11 @@ ANALYTICS_AGENT = AgentConfig(
         "temperature": 0.3,
         "request_timeout": 90,
     },
-    tools=[
+    tools=(
         "usage_analytics",
         "payment_tracking",
         "performance_monitoring",
-    ],
+    ),
 )
 
 ORCHESTRATOR_AGENT = AgentConfig(
@@ -159,11 +157,11 @@ ORCHESTRATOR_AGENT = AgentConfig(
         "temperature": 0.5,
         "request_timeout": 90,
     },
-    tools=[
+    tools=(
         "task_routing",
         "workflow_management",
         "agent_coordination",
-    ],
+    ),
 )
 
 # Agent groupings for different scenarios
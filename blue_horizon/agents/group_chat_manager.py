@@ -1,14 +1,72 @@
 """Group chat manager for coordinating multi-agent conversations."""
 
-from typing import Dict, Any, Optional, List, Union
+import re
+from collections import Counter
+from typing import Dict, Any, FrozenSet, Optional, List, Set, Union
 from datetime import datetime
 
-import autogen
 from autogen import Agent, GroupChat, GroupChatManager as AutoGenGroupChatManager
 
 from blue_horizon.agents.base_agent import BaseConciergAgent
 from blue_horizon.agents.definitions import GROUP_CHAT_MANAGER, AGENT_SYSTEM_CONFIG
 
+_COMPLETION_RE = re.compile(
+    r"\b(?:done|completed|finished|thank you|thanks)\b", re.IGNORECASE
+)
+
+# Minimum keyword hits before a message is assigned a topic
+_MIN_TOPIC_HITS = 2
+
+# Topic keyword patterns
+_TOPIC_PATTERNS = {
+    "Bookings": re.compile(
+        r"\b(?:bookings?|reservations?|rooms?|suites?|check-in|check-out)\b",
+        re.IGNORECASE,
+    ),
+    "Dining": re.compile(
+        r"\b(?:restaurants?|dining|dinner|lunch|breakfast|menu)\b", re.IGNORECASE
+    ),
+    "Events": re.compile(
+        r"\b(?:events?|conferences?|meetings?|weddings?)\b", re.IGNORECASE
+    ),
+    "Spa & Services": re.compile(
+        r"\b(?:spa|massages?|services?|amenities)\b", re.IGNORECASE
+    ),
+    "Feedback": re.compile(
+        r"\b(?:feedback|complaints?|problems?|issues?|reviews?)\b", re.IGNORECASE
+    ),
+}
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Plural endings, most specific first, and what replaces them
+_PLURAL_SUFFIXES = (
+    ("ies", "y"),
+    ("sses", "ss"),
+    ("ches", "ch"),
+    ("shes", "sh"),
+    ("xes", "x"),
+    ("s", ""),
+)
+
+# Singular endings that look like a plural "s"
+_SINGULAR_ENDINGS = ("ss", "us", "is")
+
+
+def _normalize_word(word: str) -> str:
+    """Reduce a lowercase word to its singular form, so "rooms" matches "room"."""
+    if len(word) <= 3 or word.endswith(_SINGULAR_ENDINGS):
+        return word
+    for suffix, replacement in _PLURAL_SUFFIXES:
+        if word.endswith(suffix):
+            return word[: -len(suffix)] + replacement
+    return word
+
+
+def _tokenize(message: str) -> Set[str]:
+    """Split a message into its set of lowercase, singular words."""
+    return {_normalize_word(word) for word in _WORD_RE.findall(message.lower())}
+
 
 class GroupChatManager(AutoGenGroupChatManager):
     """Manager for coordinating conversations between multiple agents."""
@@ -40,13 +98,26 @@ class GroupChatManager(AutoGenGroupChatManager):
         )
 
         self.agent_capabilities = {}
+        # Inverted index: capability keyword -> names of agents offering it
+        self._keyword_index: Dict[str, List[str]] = {}
+        # Capability keywords of each agent, split once at registration
+        self._agent_keyword_sets: Dict[str, FrozenSet[str]] = {}
         self._register_agent_capabilities()
 
     def _register_agent_capabilities(self):
         """Register capabilities of all agents in the group chat."""
         for agent in self.groupchat.agents:
             if hasattr(agent, "get_capabilities"):
-                self.agent_capabilities[agent.name] = agent.get_capabilities()
+                capabilities = agent.get_capabilities()
+                self.agent_capabilities[agent.name] = capabilities
+                keywords = [
+                    _normalize_word(keyword)
+                    for capability in capabilities.get("can_handle", ())
+                    for keyword in capability.replace("_", " ").lower().split()
+                ]
+                self._agent_keyword_sets[agent.name] = frozenset(keywords)
+                for keyword in keywords:
+                    self._keyword_index.setdefault(keyword, []).append(agent.name)
 
     def select_speaker(
         self, message: str, sender: Agent, speaking_agents: List[Agent]
@@ -69,83 +140,83 @@ class GroupChatManager(AutoGenGroupChatManager):
         self, message: str, available_agents: List[Agent]
     ) -> Optional[Agent]:
         """Route user request to the most appropriate agent."""
-        message = message.lower()
+        # Score every agent in one pass over the message's words
+        scores = Counter()
+        for token in _tokenize(message):
+            scores.update(self._keyword_index.get(token, ()))
 
-        # Score each agent's suitability for the request
-        agent_scores = {}
+        # Select agent with highest score
+        best_agent, best_score = None, -1
         for agent in available_agents:
             if agent.name in self.agent_capabilities:
-                score = self._calculate_agent_suitability(
-                    message, self.agent_capabilities[agent.name]
-                )
-                agent_scores[agent] = score
-
-        # Select agent with highest score
-        if agent_scores:
-            return max(agent_scores.items(), key=lambda x: x[1])[0]
+                score = scores[agent.name]
+                if score > best_score:
+                    best_agent, best_score = agent, score
 
-        return None
+        return best_agent
 
     def _calculate_agent_suitability(
-        self, message: str, capabilities: Dict[str, Any]
+        self, message_tokens: Set[str], agent_name: str
     ) -> float:
-        """Calculate how suitable an agent is for handling a message."""
-        score = 0.0
-
-        # Check each capability against the message
-        if "can_handle" in capabilities:
-            for capability in capabilities["can_handle"]:
-                # Convert capability to keywords
-                keywords = capability.replace("_", " ").split()
-                # Check each keyword
-                for keyword in keywords:
-                    if keyword in message:
-                        score += 1.0
-
-        return score
+        """Calculate how suitable an agent is for handling a tokenized message."""
+        keywords = self._agent_keyword_sets.get(agent_name, frozenset())
+        return float(len(keywords & message_tokens))
 
     def _should_continue_current_task(self, message: str, current_agent: Agent) -> bool:
         """Determine if current task should continue with the same agent."""
         # Check if message indicates task completion
-        completion_indicators = ["done", "completed", "finished", "thank you", "thanks"]
-        if any(indicator in message.lower() for indicator in completion_indicators):
+        if _COMPLETION_RE.search(message):
             return False
 
         # Check if message requests different service
         if current_agent.name in self.agent_capabilities:
-            current_capabilities = self.agent_capabilities[current_agent.name]
             # If message doesn't match current agent's capabilities, switch
-            if self._calculate_agent_suitability(message, current_capabilities) == 0:
+            message_tokens = _tokenize(message)
+            if self._calculate_agent_suitability(message_tokens, current_agent.name) == 0:
                 return False
 
         return True
 
     def summarize_conversation(self, messages: List[Dict[str, Any]]) -> str:
-        """Summarize the conversation history."""
-        summary = []
-        current_topic = None
+        """Summarize the conversation history, grouped by topic."""
+        # Group key points by topic, in order of first appearance
+        topics: Dict[str, List[str]] = {}
 
         for msg in messages:
             sender = msg.get("sender", "Unknown")
             content = msg.get("content", "")
 
-            # Detect topic changes
-            new_topic = self._detect_topic(content)
-            if new_topic != current_topic:
-                current_topic = new_topic
-                summary.append(f"\nTopic: {current_topic}")
+            topic_points = topics.setdefault(self._detect_topic(content), [])
 
             # Add key points
             key_points = self._extract_key_points(content)
             if key_points:
-                summary.append(f"{sender}: {key_points}")
+                topic_points.append(f"{sender}: {key_points}")
+
+        summary = []
+        for topic, points in topics.items():
+            summary.append(f"\nTopic: {topic}")
+            summary.extend(points)
 
         return "\n".join(summary)
 
     def _detect_topic(self, message: str) -> str:
-        """Detect the topic of a message."""
-        # TODO: Implement topic detection logic
-        return "General Discussion"
+        """Detect the topic of a message from its keywords.
+
+        The topic with the most keyword hits wins. Messages with fewer than
+        _MIN_TOPIC_HITS hits, or a tie between topics, are "General Discussion".
+        """
+        best_topic, best_hits, tied = None, 0, False
+        for topic, pattern in _TOPIC_PATTERNS.items():
+            hits = len(pattern.findall(message))
+            if hits > best_hits:
+                best_topic, best_hits, tied = topic, hits, False
+            elif hits and hits == best_hits:
+                tied = True
+
+        if best_hits < _MIN_TOPIC_HITS or tied:
+            return "General Discussion"
+        return best_topic
 
     def _extract_key_points(self, message: str) -> str:
         """Extract key points from a message."""
@@ -0,0 +1,39 @@
+"""Keyword-based request classification shared by the concierge agents."""
+
+import re
+from typing import Dict, Iterable
+
+
+class KeywordClassifier:
+    """Classify text into categories with a single precompiled regex scan.
+
+    Categories are checked in insertion order: when keywords from several
+    categories occur in the text, the earliest-declared category wins.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], default: str):
+        """Compile the keyword alternation for all categories.
+
+        Args:
+            categories: Mapping of category name to its trigger keywords
+            default: Category returned when no keyword matches
+        """
+        self.default = default
+        self._priority = {category: rank for rank, category in enumerate(categories)}
+        # A keyword listed under several categories keeps the earliest one
+        self._lookup: Dict[str, str] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                self._lookup.setdefault(keyword.lower(), category)
+        # Longest keywords first so multi-word phrases win over their prefixes
+        alternation = "|".join(
+            re.escape(keyword) for keyword in sorted(self._lookup, key=len, reverse=True)
+        )
+        self._pattern = re.compile(rf"\b(?:{alternation})", re.IGNORECASE)
+
+    def classify(self, text: str) -> str:
+        """Return the highest-priority category whose keywords occur in text."""
+        matches = {self._lookup[match.lower()] for match in self._pattern.findall(text)}
+        if not matches:
+            return self.default
+        return min(matches, key=self._priority.__getitem__)
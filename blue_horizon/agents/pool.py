@@ -0,0 +1,121 @@
+"""Pool of reusable agent instances shared across sessions."""
+
+import hashlib
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from autogen import ConversableAgent
+
+AgentT = TypeVar("AgentT", bound=ConversableAgent)
+
+# Seconds an agent may sit idle in the pool before it is discarded
+DEFAULT_MAX_IDLE = 300.0
+
+
+def _pool_key(agent_cls: type, kwargs: Dict[str, Any]) -> str:
+    """Hash the agent class and its constructor arguments into a pool key."""
+    identity = repr(
+        (
+            f"{agent_cls.__module__}.{agent_cls.__qualname__}",
+            sorted(kwargs.items()),
+        )
+    )
+    return hashlib.blake2b(identity.encode(), digest_size=16).hexdigest()
+
+
+class AgentPool:
+    """Reuse identically configured agents instead of constructing new ones.
+
+    Released agents are reset and kept until they are acquired again or have
+    been idle for longer than ``max_idle`` seconds, after which a background
+    timer discards them.
+    """
+
+    def __init__(self, max_idle: float = DEFAULT_MAX_IDLE):
+        """Initialize an empty pool.
+
+        Args:
+            max_idle: Seconds an idle agent is kept before being discarded
+        """
+        self.max_idle = max_idle
+        self._idle: Dict[str, List[Tuple[ConversableAgent, float]]] = {}
+        self._keys: "weakref.WeakKeyDictionary[ConversableAgent, str]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Agents currently handed out, so none is given to two callers at once
+        self._checked_out: "weakref.WeakSet[ConversableAgent]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Timer] = None
+
+    def acquire(self, agent_cls: Type[AgentT], **kwargs) -> AgentT:
+        """Get an idle agent of the given class and arguments, or construct one.
+
+        Args:
+            agent_cls: Agent class to get an instance of
+            **kwargs: Constructor arguments, also part of the pool key
+
+        Returns:
+            An agent that must be handed back with ``release`` when done
+        """
+        key = _pool_key(agent_cls, kwargs)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                agent, _ = idle.pop()
+                self._checked_out.add(agent)
+                return agent
+
+        agent = agent_cls(**kwargs)
+        with self._lock:
+            self._keys[agent] = key
+            self._checked_out.add(agent)
+        return agent
+
+    def release(self, agent: ConversableAgent):
+        """Reset an agent acquired from this pool and make it available again."""
+        with self._lock:
+            key = self._keys.get(agent)
+            if key is None:
+                raise ValueError(
+                    f"Agent {agent.name!r} was not acquired from this pool"
+                )
+            if agent not in self._checked_out:
+                raise ValueError(f"Agent {agent.name!r} was already released")
+            self._checked_out.discard(agent)
+
+        agent.reset()
+        with self._lock:
+            self._idle.setdefault(key, []).append((agent, time.monotonic()))
+            self._schedule_reap()
+
+    def _schedule_reap(self):
+        """Start the reaper timer if it is not already pending."""
+        if self._reaper is None:
+            self._reaper = threading.Timer(self.max_idle, self._reap)
+            self._reaper.daemon = True
+            self._reaper.start()
+
+    def _reap(self):
+        """Discard agents idle for longer than max_idle."""
+        cutoff = time.monotonic() - self.max_idle
+        with self._lock:
+            self._reaper = None
+            for key in list(self._idle):
+                kept = []
+                for agent, released_at in self._idle[key]:
+                    if released_at > cutoff:
+                        kept.append((agent, released_at))
+                    else:
+                        self._keys.pop(agent, None)
+                if kept:
+                    self._idle[key] = kept
+                else:
+                    del self._idle[key]
+            if self._idle:
+                self._schedule_reap()
+
+
+# Pool shared by the agents module
+agent_pool = AgentPool()
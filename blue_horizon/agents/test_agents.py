@@ -1,20 +1,31 @@
+"""Manual check of the weather agent.
+
+Run from the project root with ``python -m blue_horizon.agents.test_agents``.
+"""
+
 import os
-import sys
+import atexit
 import asyncio
 import logging
-from pathlib import Path
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger(__name__)
+from blue_horizon.agents.pool import agent_pool
+from blue_horizon.agents.weather_agent import WeatherAgent
 
-# Add the project root to Python path
-project_root = str(Path(__file__).parent.parent.parent)
-sys.path.append(project_root)
-logger.debug(f"Added {project_root} to Python path")
+# Configure logging. Records go through a queue and are written by a
+# background listener thread, so logging never blocks the event loop.
+_log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_log_listener = QueueListener(_log_queue, _log_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-from blue_horizon.agents.weather_agent import WeatherAgent
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(QueueHandler(_log_queue))
+logger = logging.getLogger(__name__)
 
 async def test_weather_agent():
     """Test the weather agent's functionality"""
@@ -23,46 +34,45 @@ async def test_weather_agent():
     load_dotenv()
     logger.debug("Loaded environment variables")
     
-    # Create weather agent
-    logger.debug("Creating weather agent")
-    weather_agent = WeatherAgent()
-    logger.debug("Weather agent created")
+    # Get a weather agent, reusing a pooled instance when available
+    logger.debug("Acquiring weather agent")
+    weather_agent = agent_pool.acquire(WeatherAgent)
+    logger.debug("Weather agent acquired")
     
     try:
-        # Test basic weather request
-        logger.info("\nTesting basic weather request:")
-        response = await weather_agent._handle_message(
-            "weather in London",
-            sender=None,
-            config={"context": {"test_type": "basic"}}
-        )
-        logger.info(f"Response: {response}")
-        
-        # Test empty location
-        logger.info("\nTesting empty location:")
-        response = await weather_agent._handle_message(
-            "weather",
-            sender=None,
-            config={"context": {"test_type": "empty"}}
-        )
-        logger.info(f"Response: {response}")
-        
-        # Test invalid location
-        logger.info("\nTesting invalid location:")
-        response = await weather_agent._handle_message(
-            "weather in InvalidCityXYZ",
-            sender=None,
-            config={"context": {"test_type": "invalid"}}
+        # Run the weather requests concurrently; they share no state
+        test_cases = [
+            ("basic weather request", "weather in London", "basic"),
+            ("empty location", "weather", "empty"),
+            ("invalid location", "weather in InvalidCityXYZ", "invalid"),
+        ]
+        responses = await asyncio.gather(
+            *(
+                weather_agent._handle_message(
+                    message,
+                    sender=None,
+                    config={"context": {"test_type": test_type}}
+                )
+                for _, message, test_type in test_cases
+            ),
+            return_exceptions=True
         )
-        logger.info(f"Response: {response}")
+        for (label, _, _), response in zip(test_cases, responses):
+            logger.info("\nTesting %s:", label)
+            if isinstance(response, Exception):
+                logger.error("Error: %s", response, exc_info=response)
+            else:
+                logger.info("Response: %s", response)
         
         # Test capabilities
         logger.info("\nTesting agent capabilities:")
         capabilities = weather_agent.get_capabilities()
-        logger.info(f"Capabilities: {capabilities}")
+        logger.info("Capabilities: %s", capabilities)
         
     except Exception as e:
-        logger.error(f"Error during testing: {str(e)}", exc_info=True)
+        logger.error("Error during testing: %s", e, exc_info=True)
+    finally:
+        agent_pool.release(weather_agent)
 
 if __name__ == "__main__":
     logger.debug("Starting test script")
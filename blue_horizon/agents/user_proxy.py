@@ -1,5 +1,7 @@
 """User proxy for handling interactions between users and the agent system."""
 
+import re
+from collections import deque
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -7,15 +9,8 @@ from autogen import UserProxyAgent
 
 from blue_horizon.agents.definitions import USER_PROXY
 
-
-class ConciergUserProxy(UserProxyAgent):
-    """User proxy agent for the Blue Horizon AI Concierge system."""
-
-    def __init__(self, **kwargs):
-        """Initialize the user proxy agent."""
-        super().__init__(
-            name=USER_PROXY.name,
-            system_message=f"""
+# The system message only depends on the static user proxy definition
+_SYSTEM_MESSAGE = f"""
             {USER_PROXY.description}
             
             Your responsibilities include:
@@ -29,16 +24,46 @@ class ConciergUserProxy(UserProxyAgent):
             - Format requests appropriately for other agents
             - Provide clear feedback to users
             - Handle errors gracefully
-            """,
+            """
+
+# Maximum number of interactions kept in a session's conversation history
+_MAX_HISTORY = 1000
+
+# Common error responses, keyed by the word identifying the error type,
+# in order of precedence
+_RESPONSES = {
+    "timeout": "I apologize, but the request timed out. Please try again.",
+    "connection": "There seems to be a connection issue. Please try again in a moment.",
+    "validation": "I couldn't process that request. Please check the format and try again.",
+}
+_ERROR_RE = re.compile("|".join(_RESPONSES))
+_DEFAULT = "I encountered an issue processing your request. Please try again or rephrase your question."
+
+
+class ConciergUserProxy(UserProxyAgent):
+    """User proxy agent for the Blue Horizon AI Concierge system."""
+
+    def __init__(self, **kwargs):
+        """Initialize the user proxy agent."""
+        super().__init__(
+            name=USER_PROXY.name,
+            system_message=_SYSTEM_MESSAGE,
             human_input_mode=USER_PROXY.human_input_mode,
             max_consecutive_auto_reply=USER_PROXY.max_consecutive_auto_reply,
             llm_config=USER_PROXY.llm_config,
             **kwargs,
         )
 
-        # Initialize session state
+        # Initialize session state, keeping only the most recent interactions
+        # so long sessions don't grow without bound
+        self.session_start = datetime.now()
+        self.conversation_history = deque(maxlen=_MAX_HISTORY)
+
+    def reset(self):
+        """Reset the agent and start a new session."""
+        super().reset()
         self.session_start = datetime.now()
-        self.conversation_history = []
+        self.conversation_history.clear()
 
     def format_message(self, message: str) -> str:
         """Format a user message for the agent system."""
@@ -66,19 +91,10 @@ class ConciergUserProxy(UserProxyAgent):
 
     async def handle_error(self, error: Exception) -> str:
         """Handle errors gracefully and return user-friendly messages."""
-        error_msg = str(error)
-
-        # Common error responses
-        responses = {
-            "timeout": "I apologize, but the request timed out. Please try again.",
-            "connection": "There seems to be a connection issue. Please try again in a moment.",
-            "validation": "I couldn't process that request. Please check the format and try again.",
-        }
-
-        # Match error type to response
-        for error_type, response in responses.items():
-            if error_type.lower() in error_msg.lower():
+        # Match error type to response, earlier entries taking precedence
+        found = set(_ERROR_RE.findall(str(error).casefold()))
+        for error_type, response in _RESPONSES.items():
+            if error_type in found:
                 return response
 
-        # Default error message
-        return "I encountered an issue processing your request. Please try again or rephrase your question."
+        return _DEFAULT
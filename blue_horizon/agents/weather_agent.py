@@ -1,14 +1,37 @@
-from typing import Dict, Any, Optional
+import asyncio
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from blue_horizon.agents.base_agent import BaseConciergAgent
 from blue_horizon.agents.config import SPECIALIST_CONFIGS
 from blue_horizon.tools.weather_tool import get_temperature
 
+# Common weather-related words that are not part of a location
+_STOP_WORDS_RE = re.compile(
+    r"\b(?:weather|temperature|forecast|in|at|for|the)\b", re.IGNORECASE
+)
+
+# Read-only view of the weather agent's configuration, looked up once
+_WEATHER_CONFIG = MappingProxyType(SPECIALIST_CONFIGS["weather"])
+
+_WEATHER_TEMPLATE = """Current weather in {location}:
+Temperature: {temperature}°C
+Conditions: {description}"""
+
+
+@lru_cache(maxsize=256)
+def _extract_location_cached(request: str) -> str:
+    """Strip weather-related words from a request, keeping the location's casing."""
+    return " ".join(_STOP_WORDS_RE.sub(" ", request).split())
+
+
 class WeatherAgent(BaseConciergAgent):
     """Specialist agent for handling weather-related inquiries"""
     
     def __init__(self):
         """Initialize the weather agent with its specific configuration"""
-        config = SPECIALIST_CONFIGS["weather"]
+        config = _WEATHER_CONFIG
         super().__init__(
             name=config["name"],
             description=config["description"],
@@ -16,6 +39,17 @@ class WeatherAgent(BaseConciergAgent):
             llm_config=config["llm_config"]
         )
         
+        # Capabilities are fixed per agent, so build them once
+        self._capabilities = MappingProxyType({
+            "name": self.agent_name,
+            "description": self.description,
+            "can_handle": (
+                "Current weather conditions",
+                "Temperature information",
+                "Weather descriptions"
+            )
+        })
+        
     def _extract_location(self, request: str) -> str:
         """Extract location from the request text.
         
@@ -25,15 +59,9 @@ class WeatherAgent(BaseConciergAgent):
         Returns:
             str: The extracted location
         """
-        # Remove common weather-related words
-        cleaned = request.lower()
-        for word in ["weather", "temperature", "forecast", "in", "at", "for", "the"]:
-            cleaned = cleaned.replace(word, "")
+        return _extract_location_cached(request)
         
-        # Clean up extra spaces and return
-        return cleaned.strip()
-        
-    def handle_request(self, request: str, context: Optional[Dict[str, Any]] = None) -> str:
+    async def handle_request(self, request: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Handle a weather-related request.
         
         Args:
@@ -52,8 +80,9 @@ class WeatherAgent(BaseConciergAgent):
             # Log the extracted location
             self.log_interaction(request, f"Extracted location: {location}", context)
             
-            # Get weather data using our tool
-            weather_data = get_temperature(location)
+            # Get weather data using our tool, off the event loop since the
+            # lookup blocks on network I/O
+            weather_data = await asyncio.to_thread(get_temperature, location)
             
             # Check for errors
             if "error" in weather_data:
@@ -83,22 +112,12 @@ class WeatherAgent(BaseConciergAgent):
         Returns:
             str: Formatted weather response
         """
-        return f"""Current weather in {weather_data['location']}:
-Temperature: {weather_data['temperature']}°C
-Conditions: {weather_data['description']}"""
+        return _WEATHER_TEMPLATE.format_map(weather_data)
     
-    def get_capabilities(self) -> Dict[str, Any]:
+    def get_capabilities(self) -> Mapping[str, Any]:
         """Get the weather agent's capabilities.
         
         Returns:
-            Dict[str, Any]: Dictionary of agent capabilities
+            Mapping[str, Any]: Read-only mapping of agent capabilities
         """
-        return {
-            "name": self.agent_name,
-            "description": self.description,
-            "can_handle": [
-                "Current weather conditions",
-                "Temperature information",
-                "Weather descriptions"
-            ]
-        } 
\ No newline at end of file
+        return self._capabilities 
\ No newline at end of file
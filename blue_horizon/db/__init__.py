@@ -0,0 +1 @@
+"""Shared database connection pools for the Blue Horizon scripts."""
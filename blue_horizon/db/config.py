@@ -0,0 +1,80 @@
+"""Connection settings for the Neon.tech database and Redis Cloud.
+
+Settings are read from the environment once, on first use, so callers
+must load their .env file before asking for them. Connection strings are
+assembled at the same time instead of on every connect.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class DBConfig:
+    """Connection settings for the Postgres database."""
+
+    host: str
+    port: int
+    user: str
+    password: str
+    name: str
+    url: str
+
+    @classmethod
+    def from_env(cls) -> "DBConfig":
+        """Read the DB_* environment variables."""
+        host = os.getenv("DB_HOST", "localhost")
+        port = int(os.getenv("DB_PORT", "5432"))
+        user = os.getenv("DB_USER", "postgres")
+        password = os.getenv("DB_PASSWORD", "postgres")
+        name = os.getenv("DB_NAME", "blue_horizon")
+        return cls(
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            name=name,
+            url=f"postgresql://{user}:{password}@{host}:{port}/{name}",
+        )
+
+    def connect_kwargs(self) -> Dict[str, Any]:
+        """Get the settings as asyncpg connection arguments."""
+        return {
+            "host": self.host,
+            "port": self.port,
+            "user": self.user,
+            "password": self.password,
+            "database": self.name,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class RedisConfig:
+    """Connection settings for Redis Cloud."""
+
+    host: Optional[str]
+    port: int
+    password: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "RedisConfig":
+        """Read the REMOTE_REDIS_* environment variables."""
+        return cls(
+            host=os.getenv("REMOTE_REDIS_HOST"),
+            port=int(os.getenv("REMOTE_REDIS_PORT", "6379")),
+            password=os.getenv("REMOTE_REDIS_PASSWORD"),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_db_config() -> DBConfig:
+    """Get the database settings, reading the environment on first use."""
+    return DBConfig.from_env()
+
+
+@lru_cache(maxsize=1)
+def get_redis_config() -> RedisConfig:
+    """Get the Redis settings, reading the environment on first use."""
+    return RedisConfig.from_env()
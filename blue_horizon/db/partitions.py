@@ -0,0 +1,39 @@
+"""Monthly range partitions for date-partitioned tables."""
+
+from datetime import date, timedelta
+
+from psycopg2 import sql
+from psycopg2.extensions import connection as PGConnection
+
+
+def ensure_month_partitions(
+    conn: PGConnection, table: str, first_date: date, last_date: date
+):
+    """Create any missing monthly partitions covering a date range.
+
+    Only applies when the table is range-partitioned by date, which keeps
+    scans and inserts confined to recent months; plain tables are left as is.
+    Partitions are named like room_availability_y2024m11.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass",
+            (table,),
+        )
+        if cur.fetchone() is None:
+            return
+
+        month = first_date.replace(day=1)
+        while month <= last_date:
+            next_month = (month + timedelta(days=32)).replace(day=1)
+            cur.execute(
+                sql.SQL(
+                    "CREATE TABLE IF NOT EXISTS {} PARTITION OF {} "
+                    "FOR VALUES FROM (%s) TO (%s)"
+                ).format(
+                    sql.Identifier(f"{table}_y{month.year}m{month.month:02d}"),
+                    sql.Identifier(table),
+                ),
+                (month, next_month),
+            )
+            month = next_month
@@ -0,0 +1,115 @@
+"""Process-wide database connection pools.
+
+Scripts that talk to the Neon.tech database get their connections here
+instead of connecting directly, so repeated work in one process reuses
+already established TLS sessions. Pools are created lazily on first use,
+after the caller has loaded its environment variables.
+"""
+
+import asyncio
+import atexit
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import asyncpg
+from psycopg2.extensions import connection as PGConnection
+from psycopg2.pool import ThreadedConnectionPool
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from blue_horizon.db.config import get_db_config
+
+MIN_CONNECTIONS = 1
+MAX_CONNECTIONS = 10
+ENGINE_POOL_SIZE = 5
+
+_async_pool: Optional[asyncpg.Pool] = None
+
+
+def _connect_kwargs() -> Dict[str, Any]:
+    """Get the asyncpg connection settings from the environment."""
+    return get_db_config().connect_kwargs()
+
+
+@lru_cache(maxsize=1)
+def get_pg_pool() -> ThreadedConnectionPool:
+    """Get the psycopg2 connection pool for the database at DB_URL."""
+    db_url = os.getenv("DB_URL")
+    if not db_url:
+        raise ValueError("DB_URL environment variable is not set")
+
+    pool = ThreadedConnectionPool(MIN_CONNECTIONS, MAX_CONNECTIONS, dsn=db_url)
+    atexit.register(pool.closeall)
+    return pool
+
+
+@contextmanager
+def pg_connection(autocommit: bool = False) -> Iterator[PGConnection]:
+    """Borrow a psycopg2 connection from the pool.
+
+    Without autocommit, the transaction is committed when the block exits
+    normally and rolled back if it raises.
+
+    Args:
+        autocommit: Whether each statement should be committed immediately
+    """
+    pool = get_pg_pool()
+    conn = pool.getconn()
+    try:
+        conn.autocommit = autocommit
+        yield conn
+        if not autocommit:
+            conn.commit()
+    except Exception:
+        if not autocommit:
+            conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+async def get_async_pool() -> asyncpg.Pool:
+    """Get the asyncpg connection pool, creating it on first use.
+
+    The pool belongs to the running event loop; call close_async_pool
+    before that loop finishes.
+    """
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = await asyncpg.create_pool(
+            min_size=MIN_CONNECTIONS, max_size=MAX_CONNECTIONS, **_connect_kwargs()
+        )
+    return _async_pool
+
+
+async def close_async_pool():
+    """Close the asyncpg connection pool if it was created."""
+    global _async_pool
+    if _async_pool is not None:
+        pool, _async_pool = _async_pool, None
+        await pool.close()
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """Get the SQLAlchemy engine for the database, with a connection pool."""
+    return create_engine(
+        get_db_config().url, pool_size=ENGINE_POOL_SIZE, pool_pre_ping=True
+    )
+
+
+async def execute_concurrently(pool: asyncpg.Pool, statements: Iterable[str]):
+    """Run independent statements at the same time on separate connections.
+
+    Args:
+        pool: Pool to borrow a connection from for each statement
+        statements: SQL statements that do not depend on each other
+    """
+
+    async def execute(statement: str):
+        async with pool.acquire() as conn:
+            await conn.execute(statement)
+
+    await asyncio.gather(*(execute(statement) for statement in statements))
@@ -7,6 +7,8 @@ This example demonstrates:
 3. Proper currency formatting with symbols
 """
 
+import sys
+
 from blue_horizon.tools.currency_tool import (
     CurrencyTool,
     Currency,
@@ -33,9 +35,11 @@ def main():
     try:
         print("\nExample 2 - Current exchange rates (base: USD):")
         rates = tool.get_exchange_rates(Currency.USD)
-        for currency, rate in rates.items():
-            formatted = tool.format_amount(rate, currency)
-            print(f"1 USD = {formatted}")
+        lines = [
+            f"1 USD = {tool.format_amount(rate, currency)}\n"
+            for currency, rate in rates.items()
+        ]
+        sys.stdout.write("".join(lines))
     except CurrencyConversionError as e:
         print(f"Error getting exchange rates: {str(e)}")
 
@@ -10,22 +10,98 @@ This demo showcases:
 """
 
 import os
+import atexit
+import asyncio
 import logging
+import queue
+import threading
 import time
+from contextlib import ExitStack
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timedelta
 from blue_horizon.services.nl_query_service import NLQueryService
 from blue_horizon.models.openai_service import OpenAIService, OpenAIModel, RequestPriority
 from blue_horizon.database.database import HotelDatabase
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+# Configure logging. Records go through a queue and are written by a
+# background listener thread, so logging never blocks the query tasks.
+_log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter(
+    '%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%H:%M:%S'
-)
+))
+_log_listener = QueueListener(_log_queue, _log_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
-def process_query_with_retry(
+# Maximum number of queries sent to the service at the same time
+MAX_PARALLEL_QUERIES = 3
+
+# Requests per minute allowed by the rate limiter
+MAX_REQUESTS_PER_MINUTE = 60
+
+class RateLimiter:
+    """Token bucket that only waits when requests exceed the allowed rate.
+    
+    The bucket is not tied to an event loop, so it can be shared by query
+    suites running in separate loops or threads.
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        """Initialize a full bucket.
+        
+        Args:
+            max_rate: Number of requests allowed per time period
+            time_period: Length of the time period in seconds
+        """
+        self.max_rate = max_rate
+        self._refill_rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _try_acquire(self) -> float:
+        """Take a token if one is available.
+        
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.max_rate, self._tokens + (now - self._updated) * self._refill_rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self._refill_rate
+    
+    async def __aenter__(self):
+        while (delay := self._try_acquire()) > 0:
+            await asyncio.sleep(delay)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+rate_limiter = RateLimiter(MAX_REQUESTS_PER_MINUTE)
+
+def _retry_after(error: Exception):
+    """Get the delay requested by a 429 response's retry-after header, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+async def process_query_with_retry(
     service: NLQueryService,
     query: str,
     context: dict = None,
@@ -34,136 +110,160 @@ def process_query_with_retry(
 ) -> None:
     """Process a query with retry logic for rate limits.
     
+    The blocking service call runs in a worker thread so several queries can
+    be in flight at once.
+    
     Args:
         service: NLQueryService instance
         query: Natural language query to process
         context: Optional context dictionary with user/session info
         max_retries: Maximum number of retry attempts
-        base_delay: Base delay between retries in seconds
+        base_delay: Base delay between retries when the rate limit response
+            has no retry-after header, in seconds
     """
     for attempt in range(max_retries + 1):
         try:
-            logger.info(f"\nProcessing query: {query}")
+            logger.info("\nProcessing query: %s", query)
             if context:
-                logger.info(f"Context: {context}")
+                logger.info("Context: %s", context)
                 
-            result = service.process_query(query, context=context)
+            async with rate_limiter:
+                result = await asyncio.to_thread(
+                    service.process_query, query, context=context
+                )
             
             # Log results
-            logger.info(f"Intent: {result.intent}")
-            logger.info(f"Category: {result.category}")
-            logger.info(f"Entities: {result.entities}")
+            logger.info("Intent: %s", result.intent)
+            logger.info("Category: %s", result.category)
+            logger.info("Entities: %s", result.entities)
             if result.sql_query:
-                logger.info(f"Generated SQL: {result.sql_query}")
+                logger.info("Generated SQL: %s", result.sql_query)
             if result.response:
-                logger.info(f"Response: {result.response}")
+                logger.info("Response: %s", result.response)
             if result.followup_questions:
                 logger.info("Follow-up questions:")
                 for q in result.followup_questions:
-                    logger.info(f"- {q}")
+                    logger.info("- %s", q)
             return result
             
         except Exception as e:
             if "429" in str(e) and attempt < max_retries:
-                delay = base_delay * (2 ** attempt)  # Exponential backoff
-                logger.warning(f"Rate limit hit. Waiting {delay} seconds before retry...")
-                time.sleep(delay)
+                # Wait as long as the API asks, else back off exponentially
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = base_delay * (2 ** attempt)
+                logger.warning("Rate limit hit. Waiting %s seconds before retry...", delay)
+                await asyncio.sleep(delay)
                 continue
-            logger.error(f"Error processing query: {e}")
+            logger.error("Error processing query: %s", e)
             break
 
-def test_basic_queries(service: NLQueryService):
+async def run_queries(
+    service: NLQueryService, semaphore: asyncio.Semaphore, queries: list
+) -> list:
+    """Run independent queries concurrently, bounded by a shared semaphore.
+    
+    Args:
+        service: NLQueryService instance
+        semaphore: Semaphore shared by every suite, limiting in-flight queries
+        queries: List of (query, context) tuples
+        
+    Returns:
+        List of results in the same order as the queries
+    """
+    async def run_query(query: str, context: dict = None):
+        async with semaphore:
+            return await process_query_with_retry(service, query, context=context)
+
+    return await asyncio.gather(
+        *(run_query(query, context) for query, context in queries)
+    )
+
+async def test_basic_queries(service: NLQueryService, semaphore: asyncio.Semaphore):
     """Test basic hotel queries."""
     logger.info("\n=== Testing Basic Queries ===")
     
-    # Room information query
-    query = "What deluxe rooms are available next week with ocean view?"
-    process_query_with_retry(service, query)
-    time.sleep(20)
-    
-    # Service booking query
-    query = "I need to book a couples massage for tomorrow afternoon, preferably around 2 PM"
-    process_query_with_retry(service, query)
-    time.sleep(20)
-    
-    # Query with customer context
+    # Customer context for the loyalty tier query
     context = {
         'customer_id': 'CUST123',
         'loyalty_tier': 'Gold',
         'previous_stays': 5
     }
-    query = "What special offers are available for my tier?"
-    process_query_with_retry(service, query, context=context)
+    
+    await run_queries(service, semaphore, [
+        # Room information query
+        ("What deluxe rooms are available next week with ocean view?", None),
+        # Service booking query
+        ("I need to book a couples massage for tomorrow afternoon, preferably around 2 PM", None),
+        # Query with customer context
+        ("What special offers are available for my tier?", context),
+    ])
 
-def test_complex_queries(service: NLQueryService):
+async def test_complex_queries(service: NLQueryService, semaphore: asyncio.Semaphore):
     """Test complex business scenarios."""
     logger.info("\n=== Testing Complex Queries ===")
     
-    # Multi-intent booking query
-    query = "I want to book a deluxe room for next weekend and also reserve a table at your best restaurant for Saturday night for 4 people"
-    process_query_with_retry(service, query)
-    time.sleep(20)
-    
-    # Staff scheduling query
-    query = "Which spa therapists are available for deep tissue massages tomorrow between 2 PM and 6 PM?"
-    process_query_with_retry(service, query)
-    time.sleep(20)
-    
-    # Feedback analysis query
-    query = "Show me customer feedback about our restaurant service from the last month with ratings above 4 stars"
-    process_query_with_retry(service, query)
-    time.sleep(20)
-    
-    # Event booking query
-    query = "What's the status of all wedding bookings in the Grand Ballroom next month with more than 100 guests?"
-    process_query_with_retry(service, query)
-    time.sleep(20)
-    
-    # Complex availability query
-    query = "Find available event spaces that can host a corporate conference next week for 200 people with catering and AV equipment"
-    process_query_with_retry(service, query)
+    await run_queries(service, semaphore, [
+        # Multi-intent booking query
+        ("I want to book a deluxe room for next weekend and also reserve a table at your best restaurant for Saturday night for 4 people", None),
+        # Staff scheduling query
+        ("Which spa therapists are available for deep tissue massages tomorrow between 2 PM and 6 PM?", None),
+        # Feedback analysis query
+        ("Show me customer feedback about our restaurant service from the last month with ratings above 4 stars", None),
+        # Event booking query
+        ("What's the status of all wedding bookings in the Grand Ballroom next month with more than 100 guests?", None),
+        # Complex availability query
+        ("Find available event spaces that can host a corporate conference next week for 200 people with catering and AV equipment", None),
+    ])
 
-def test_analytical_queries(service: NLQueryService):
+async def test_analytical_queries(service: NLQueryService, semaphore: asyncio.Semaphore):
     """Test analytical and reporting queries."""
     logger.info("\n=== Testing Analytical Queries ===")
     
-    # Revenue analysis
-    query = "What was our total revenue from room bookings last month, broken down by room type?"
-    process_query_with_retry(service, query)
-    time.sleep(20)
-    
-    # Occupancy analysis
-    query = "Show me the occupancy rate for each room type over the past 3 months"
-    process_query_with_retry(service, query)
-    time.sleep(20)
-    
-    # Service popularity
-    query = "Which spa services were most popular among Gold tier members this year?"
-    process_query_with_retry(service, query)
+    await run_queries(service, semaphore, [
+        # Revenue analysis
+        ("What was our total revenue from room bookings last month, broken down by room type?", None),
+        # Occupancy analysis
+        ("Show me the occupancy rate for each room type over the past 3 months", None),
+        # Service popularity
+        ("Which spa services were most popular among Gold tier members this year?", None),
+    ])
+
+async def run_test_suites(service: NLQueryService):
+    """Run the independent test suites concurrently."""
+    # One semaphore for all suites, so MAX_PARALLEL_QUERIES bounds the total
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_QUERIES)
+    await asyncio.gather(
+        test_basic_queries(service, semaphore),
+        test_complex_queries(service, semaphore),
+        test_analytical_queries(service, semaphore),
+    )
+
+def _cleanup_service(service: NLQueryService):
+    """Release the resources held by the service."""
+    logger.info("\nCleaning up...")
+    service.cleanup()
 
 def main():
     """Run comprehensive tests of NLQueryService."""
     try:
-        # Initialize services
-        openai_service = OpenAIService(
-            model=OpenAIModel.GPT4,
-            temperature=0.1,
-            priority=RequestPriority.HIGH
-        )
-        db = HotelDatabase()
-        service = NLQueryService(openai_service, db)
-        
-        # Run test suites
-        test_basic_queries(service)
-        test_complex_queries(service)
-        test_analytical_queries(service)
+        with ExitStack() as stack:
+            # Initialize services
+            openai_service = OpenAIService(
+                model=OpenAIModel.GPT4,
+                temperature=0.1,
+                priority=RequestPriority.HIGH
+            )
+            db = HotelDatabase()
+            service = NLQueryService(openai_service, db)
+            stack.callback(_cleanup_service, service)
+            
+            # Run test suites
+            asyncio.run(run_test_suites(service))
         
     except Exception as e:
-        logger.error(f"Error in test script: {e}")
+        logger.error("Error in test script: %s", e)
     finally:
-        logger.info("\nCleaning up...")
-        if 'service' in locals():
-            service.cleanup()
         logger.info("Test script completed.")
 
 if __name__ == "__main__":
@@ -1,36 +1,66 @@
 """Example script demonstrating how to query the migrated vector stores."""
 
+import sys
+
 from blue_horizon.search.chroma_store import ChromaVectorStore
 from blue_horizon.utils.logger import log
 
+# Metadata filters used by the example searches
+_FILTER_SERVICES = {"category": "Services"}
+_FILTER_MOST_VIEWED = {"views": {"$gte": 100}}
+_FILTER_HIGH_RATED = {"rating": {"$gte": 4.5}}
+_FILTER_NEARBY_BUDGET = {
+    "$and": [{"distance_km": {"$lte": 2.0}}, {"price_range": {"$in": ["$", "$$"]}}]
+}
+_FILTER_ENTERTAINMENT = {"category": "Entertainment"}
+
+_FAQ_TEMPLATE = (
+    "\nResult {i} (Score: {score:.3f})\n"
+    "Category: {category}\n"
+    "Subcategory: {subcategory}\n"
+    "FAQ ID: {faq_id}\n"
+    "Helpful Votes: {helpful_votes}\n"
+    "Views: {views}\n"
+    "Text:\n{text}\n"
+)
+
+_RECOMMENDATION_TEMPLATE = (
+    "\nResult {i} (Score: {score:.3f})\n"
+    "Name: {name}\n"
+    "Category: {category}\n"
+    "Rating: {rating}\n"
+    "Price Range: {price_range}\n"
+    "Distance: {distance_km}km\n"
+    "Tags: {tags}\n"
+    "Text:\n{text}\n"
+)
+
+
+def _write_results(template, results, header):
+    """Format all results with a template and write them in a single call."""
+    parts = [header, "-" * 80, "\n"]
+    for i, result in enumerate(results, 1):
+        fields = {**result["metadata"], "score": result["score"], "text": result["text"]}
+        parts.append(template.format_map({**fields, "i": i}))
+    sys.stdout.write("".join(parts))
+
 
 def print_faq_results(results, query, section=""):
     """Print FAQ search results in a readable format."""
-    print(f"\nSearch results for FAQ query{section}: '{query}'")
-    print("-" * 80)
-    for i, result in enumerate(results, 1):
-        print(f"\nResult {i} (Score: {result['score']:.3f})")
-        print(f"Category: {result['metadata']['category']}")
-        print(f"Subcategory: {result['metadata']['subcategory']}")
-        print(f"FAQ ID: {result['metadata']['faq_id']}")
-        print(f"Helpful Votes: {result['metadata']['helpful_votes']}")
-        print(f"Views: {result['metadata']['views']}")
-        print(f"Text:\n{result['text']}")
+    _write_results(
+        _FAQ_TEMPLATE,
+        results,
+        f"\nSearch results for FAQ query{section}: '{query}'\n",
+    )
 
 
 def print_recommendation_results(results, query, section=""):
     """Print recommendation search results in a readable format."""
-    print(f"\nSearch results for recommendation query{section}: '{query}'")
-    print("-" * 80)
-    for i, result in enumerate(results, 1):
-        print(f"\nResult {i} (Score: {result['score']:.3f})")
-        print(f"Name: {result['metadata']['name']}")
-        print(f"Category: {result['metadata']['category']}")
-        print(f"Rating: {result['metadata']['rating']}")
-        print(f"Price Range: {result['metadata']['price_range']}")
-        print(f"Distance: {result['metadata']['distance_km']}km")
-        print(f"Tags: {result['metadata']['tags']}")
-        print(f"Text:\n{result['text']}")
+    _write_results(
+        _RECOMMENDATION_TEMPLATE,
+        results,
+        f"\nSearch results for recommendation query{section}: '{query}'\n",
+    )
 
 
 def main():
@@ -59,14 +89,14 @@ def main():
 
     # Search in specific category
     query = "What services are available?"
-    filter_metadata = {"category": "Services"}
-    results = store.search("faqs", query, top_k=2, filter_metadata=filter_metadata)
+    results = store.search("faqs", query, top_k=2, filter_metadata=_FILTER_SERVICES)
     print_faq_results(results, query, " (filtered by Services category)")
 
     # Search for most viewed FAQs
     query = "hotel policies"
-    filter_metadata = {"views": {"$gte": 100}}
-    results = store.search("faqs", query, top_k=2, filter_metadata=filter_metadata)
+    results = store.search(
+        "faqs", query, top_k=2, filter_metadata=_FILTER_MOST_VIEWED
+    )
     print_faq_results(results, query, " (filtered by most viewed)")
 
     print("\n=== Recommendation Queries ===")
@@ -87,9 +117,8 @@ def main():
 
     # High-rated places (rating >= 4.5)         
     query = "best places to eat"
-    filter_metadata = {"rating": {"$gte": 4.5}}
     results = store.search(
-        "recommendations", query, top_k=2, filter_metadata=filter_metadata
+        "recommendations", query, top_k=2, filter_metadata=_FILTER_HIGH_RATED
     )
     print_recommendation_results(results, query, " (high-rated places)")
 
@@ -97,11 +126,11 @@ def main():
     print(
         "\nSearch results for recommendation query (nearby budget-friendly places): 'places to visit'\n"
     )
-    filter_metadata = {
-        "$and": [{"distance_km": {"$lte": 2.0}}, {"price_range": {"$in": ["$", "$$"]}}]
-    }
     results = store.search(
-        "recommendations", "places to visit", top_k=2, filter_metadata=filter_metadata
+        "recommendations",
+        "places to visit",
+        top_k=2,
+        filter_metadata=_FILTER_NEARBY_BUDGET,
     )
     print_recommendation_results(
         results, "places to visit", " (nearby budget-friendly)"
@@ -109,9 +138,8 @@ def main():
 
     # Category-specific search
     query = "entertainment"
-    filter_metadata = {"category": "Entertainment"}
     results = store.search(
-        "recommendations", query, top_k=2, filter_metadata=filter_metadata
+        "recommendations", query, top_k=2, filter_metadata=_FILTER_ENTERTAINMENT
     )
     print_recommendation_results(results, query, " (entertainment category)")
 
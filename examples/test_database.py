@@ -1,6 +1,8 @@
 """Test script for verifying database functionality."""
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from blue_horizon.database.database import HotelDatabase
 from blue_horizon.utils.logger import log, LogLevel
@@ -23,59 +25,87 @@ def test_database_operations():
         log("\nResetting database to ensure clean state...", LogLevel.ON)
         db.reset_database()
 
-        # Test room information retrieval
-        log("\nTesting room information retrieval...", LogLevel.ON)
-        rooms = db.get_room_info(room_type="deluxe")
-        log(f"Found {len(rooms)} deluxe rooms", LogLevel.ON)
-
-        # Test customer information retrieval
-        log("\nTesting customer information retrieval...", LogLevel.ON)
-        customers = db.get_customer_info()
-        log(f"Found {len(customers)} customers", LogLevel.ON)
-
-        # Test booking information retrieval
-        log("\nTesting booking information retrieval...", LogLevel.ON)
-        bookings = db.get_booking_info()
-        log(f"Found {len(bookings)} bookings", LogLevel.ON)
-
-        # Test service information retrieval
-        log("\nTesting service information retrieval...", LogLevel.ON)
-        services = db.get_service_info(service_type="spa")
-        log(f"Found {len(services)} spa services", LogLevel.ON)
-
-        # Test staff information retrieval
-        log("\nTesting staff information retrieval...", LogLevel.ON)
-        staff = db.get_staff_info()
-        log(f"Found {len(staff)} staff members", LogLevel.ON)
-
-        # Test event space availability
-        log("\nTesting event space availability...", LogLevel.ON)
+        # The lookups below are read-only and independent, so run them
+        # concurrently; results are reported in order
         tomorrow = datetime.now() + timedelta(days=1)
-        spaces = db.get_event_space_info(capacity=50, date=tomorrow)
-        log(f"Found {len(spaces)} available event spaces for tomorrow", LogLevel.ON)
-
-        # Test restaurant booking information
-        log("\nTesting restaurant booking information...", LogLevel.ON)
-        restaurant_bookings = db.get_restaurant_booking_info(date=tomorrow)
-        log(
-            f"Found {len(restaurant_bookings)} restaurant bookings for tomorrow",
-            LogLevel.ON,
-        )
-
-        # Test amenity information
-        log("\nTesting amenity information retrieval...", LogLevel.ON)
-        amenities = db.get_amenity_info(category="pool")
-        log(f"Found {len(amenities)} pool amenities", LogLevel.ON)
-
-        # Test promotion information
-        log("\nTesting promotion information retrieval...", LogLevel.ON)
-        promotions = db.get_promotion_info(status="active")
-        log(f"Found {len(promotions)} active promotions", LogLevel.ON)
-
-        # Test FAQ information
-        log("\nTesting FAQ information retrieval...", LogLevel.ON)
-        faqs = db.get_faq_info(category="general")
-        log(f"Found {len(faqs)} general FAQs", LogLevel.ON)
+        lookups = [
+            (
+                "room information retrieval",
+                lambda db: db.get_room_info(room_type="deluxe"),
+                "deluxe rooms",
+            ),
+            (
+                "customer information retrieval",
+                lambda db: db.get_customer_info(),
+                "customers",
+            ),
+            (
+                "booking information retrieval",
+                lambda db: db.get_booking_info(),
+                "bookings",
+            ),
+            (
+                "service information retrieval",
+                lambda db: db.get_service_info(service_type="spa"),
+                "spa services",
+            ),
+            (
+                "staff information retrieval",
+                lambda db: db.get_staff_info(),
+                "staff members",
+            ),
+            (
+                "event space availability",
+                lambda db: db.get_event_space_info(capacity=50, date=tomorrow),
+                "available event spaces for tomorrow",
+            ),
+            (
+                "restaurant booking information",
+                lambda db: db.get_restaurant_booking_info(date=tomorrow),
+                "restaurant bookings for tomorrow",
+            ),
+            (
+                "amenity information retrieval",
+                lambda db: db.get_amenity_info(category="pool"),
+                "pool amenities",
+            ),
+            (
+                "promotion information retrieval",
+                lambda db: db.get_promotion_info(status="active"),
+                "active promotions",
+            ),
+            (
+                "FAQ information retrieval",
+                lambda db: db.get_faq_info(category="general"),
+                "general FAQs",
+            ),
+        ]
+
+        # HotelDatabase isn't known to be thread-safe, so each worker
+        # thread opens its own connection
+        worker_state = threading.local()
+        worker_dbs = []
+        worker_dbs_lock = threading.Lock()
+
+        def run_lookup(lookup):
+            worker_db = getattr(worker_state, "db", None)
+            if worker_db is None:
+                worker_db = worker_state.db = HotelDatabase(db_url)
+                with worker_dbs_lock:
+                    worker_dbs.append(worker_db)
+            return lookup(worker_db)
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(lookups)) as executor:
+                futures = [
+                    executor.submit(run_lookup, lookup) for _, lookup, _ in lookups
+                ]
+                for (name, _, description), future in zip(lookups, futures):
+                    log(f"\nTesting {name}...", LogLevel.ON)
+                    log(f"Found {len(future.result())} {description}", LogLevel.ON)
+        finally:
+            for worker_db in worker_dbs:
+                worker_db.cleanup()
 
         log("\nAll database tests completed successfully!", LogLevel.ON)
 
@@ -1,6 +1,7 @@
 """Example usage of the Blue Horizon AI Concierge package."""
 
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 from blue_horizon import (
     OpenAIModel,
@@ -11,21 +12,40 @@ from blue_horizon import (
 )
 
 
+# Generated descriptions, keyed by service type and models
+_DESCRIPTION_CACHE: Dict[Tuple[str, OpenAIModel, OpenAIModel], str] = {}
+
+
+@lru_cache(maxsize=None)
+def _get_openai_service(
+    primary_model: OpenAIModel, fallback_model: OpenAIModel
+) -> OpenAIService:
+    """Get a shared OpenAI service, reused across calls and retries."""
+    return OpenAIService(primary_model=primary_model, fallback_model=fallback_model)
+
+
 def generate_spa_description() -> Optional[str]:
     """Generate a service description for spa treatment with fallback handling.
 
+    A description already generated in this process is returned from the
+    cache without calling the API again.
+
     Returns:
         str: Generated description text, or None if generation fails
     """
-    openai_service = OpenAIService(
-        primary_model=OpenAIModel.GPT4,
-        fallback_model=OpenAIModel.GPT35_TURBO,
-    )
+    service_type = "Spa Treatment"
+    primary_model, fallback_model = OpenAIModel.GPT4, OpenAIModel.GPT35_TURBO
+    cache_key = (service_type, primary_model, fallback_model)
+    if cache_key in _DESCRIPTION_CACHE:
+        return _DESCRIPTION_CACHE[cache_key]
 
+    openai_service = _get_openai_service(primary_model, fallback_model)
     description = openai_service.generate_service_description(
-        service_type="Spa Treatment",
+        service_type=service_type,
         static_fallbacks=SERVICE_DESCRIPTIONS,  # Fallback from prompts.py
     )
+    if description is not None:
+        _DESCRIPTION_CACHE[cache_key] = description
     return description
 
 
@@ -1,49 +1,43 @@
-import os
+import sys
 from pathlib import Path
-import psycopg2
 from dotenv import load_dotenv
+from blue_horizon.db.pool import pg_connection
+
+# Give index builds more memory and parallel workers for this transaction only
+_MAINTENANCE_SETTINGS = (
+    "SET LOCAL maintenance_work_mem = '1GB';\n"
+    "SET LOCAL max_parallel_maintenance_workers = 4;\n"
+)
 
 
 def main():
     # Load environment variables
     load_dotenv()
 
-    # Get database connection details
-    db_url = os.getenv("DB_URL")
-    if not db_url:
-        raise ValueError("DB_URL environment variable is not set")
-
     try:
-        # Connect to the database
+        # Connect to the database; all indexes are created in one transaction
         print("Connecting to Neon.tech database...")
-        conn = psycopg2.connect(db_url)
-        conn.autocommit = True  # We want each statement to be committed immediately
-
-        # Create a cursor
-        cur = conn.cursor()
-
-        # Read the SQL script
-        script_path = Path(__file__).parent / "add_indexes.sql"
-        with open(script_path, "r") as f:
-            sql_script = f.read()
-
-        print("Creating indexes...")
-        # Execute each statement separately
-        statements = [stmt.strip() for stmt in sql_script.split(";") if stmt.strip()]
-        for stmt in statements:
-            print(f"Executing: {stmt[:100]}...")  # Print first 100 chars of statement
-            cur.execute(stmt)
+        with pg_connection() as conn, conn.cursor() as cur:
+            # Read the SQL script
+            script_path = Path(__file__).parent / "add_indexes.sql"
+            with open(script_path, "r") as f:
+                sql_script = f.read()
+
+            print("Creating indexes...")
+            statements = [stmt.strip() for stmt in sql_script.split(";") if stmt.strip()]
+            # Print the first 100 chars of each statement in one write
+            sys.stdout.write(
+                "".join(f"Executing: {stmt[:100]}...\n" for stmt in statements)
+            )
+
+            # Send the whole script in a single round trip
+            cur.execute(_MAINTENANCE_SETTINGS + ";\n".join(statements) + ";")
 
         print("Indexes created successfully!")
 
     except Exception as e:
         print(f"Error creating indexes: {str(e)}")
         raise
-    finally:
-        if "cur" in locals():
-            cur.close()
-        if "conn" in locals():
-            conn.close()
 
 
 if __name__ == "__main__":
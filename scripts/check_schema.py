@@ -1,9 +1,10 @@
 """Script to check database schema."""
 
 import asyncio
-import asyncpg
+from itertools import groupby
+from operator import itemgetter
 from dotenv import load_dotenv
-import os
+from blue_horizon.db.pool import close_async_pool, get_async_pool
 
 
 async def main():
@@ -12,56 +13,49 @@ async def main():
     load_dotenv()
 
     print("Connecting to database...")
-    conn = await asyncpg.connect(
-        host=os.getenv("DB_HOST"),
-        port=os.getenv("DB_PORT"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        database=os.getenv("DB_NAME"),
-    )
+    pool = await get_async_pool()
 
     try:
-        # List all schemas
-        print("\nAvailable schemas:")
-        schemas = await conn.fetch(
-            """
-        SELECT schema_name 
-        FROM information_schema.schemata
-        """
-        )
-        for schema in schemas:
-            print(f"- {schema['schema_name']}")
-
-        # List all tables in public schema
-        print("\nTables in public schema:")
-        tables = await conn.fetch(
+        async with pool.acquire() as conn:
+            # List all schemas
+            print("\nAvailable schemas:")
+            schemas = await conn.fetch(
+                """
+            SELECT schema_name 
+            FROM information_schema.schemata
             """
-        SELECT table_name 
-        FROM information_schema.tables 
-        WHERE table_schema = 'public'
-        """
-        )
-        for table in tables:
-            print(f"- {table['table_name']}")
+            )
+            for schema in schemas:
+                print(f"- {schema['schema_name']}")
 
-            # Get table columns
+            # List all tables in public schema with their columns, fetched in
+            # one query and grouped by table
+            print("\nTables in public schema:")
             columns = await conn.fetch(
                 """
-            SELECT column_name, data_type, is_nullable
-            FROM information_schema.columns
-            WHERE table_schema = 'public' AND table_name = $1
-            """,
-                table["table_name"],
+            SELECT t.table_name, c.column_name, c.data_type, c.is_nullable
+            FROM information_schema.tables t
+            LEFT JOIN information_schema.columns c
+                USING (table_schema, table_name)
+            WHERE t.table_schema = 'public'
+            ORDER BY t.table_name, c.ordinal_position
+            """
             )
-
-            print("  Columns:")
-            for col in columns:
-                nullable = "NULL" if col["is_nullable"] == "YES" else "NOT NULL"
-                print(f"  - {col['column_name']}: {col['data_type']} {nullable}")
-            print()
+            for table_name, table_columns in groupby(
+                columns, key=itemgetter("table_name")
+            ):
+                print(f"- {table_name}")
+
+                print("  Columns:")
+                for col in table_columns:
+                    if col["column_name"] is None:
+                        continue
+                    nullable = "NULL" if col["is_nullable"] == "YES" else "NOT NULL"
+                    print(f"  - {col['column_name']}: {col['data_type']} {nullable}")
+                print()
 
     finally:
-        await conn.close()
+        await close_async_pool()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,17 @@
 """Script to check vector tables in Neon.tech database."""
 
-import os
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from dotenv import load_dotenv
+from blue_horizon.db.pool import get_engine
+
+_COUNT_QUERY = text(
+    """
+    SELECT
+        (SELECT COUNT(*) FROM faq_knowledge_base),
+        (SELECT COUNT(*) FROM recommendations_knowledge_base),
+        (SELECT COUNT(*) FROM embeddings)
+    """
+)
 
 
 def main():
@@ -10,30 +19,23 @@ def main():
     # Load environment variables
     load_dotenv()
 
-    # Create database URL
-    db_url = (
-        f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
-        f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-    )
-
-    # Create engine
-    engine = create_engine(db_url)
+    # Get the shared engine
+    engine = get_engine()
 
-    # Check tables
+    # Count the rows of all tables in a single round trip
     with engine.connect() as conn:
-        print("\nFAQ Knowledge Base:")
-        result = conn.execute(text("SELECT COUNT(*) FROM faq_knowledge_base"))
-        print(f"- {result.scalar()} rows")
-
-        print("\nRecommendations Knowledge Base:")
-        result = conn.execute(
-            text("SELECT COUNT(*) FROM recommendations_knowledge_base")
-        )
-        print(f"- {result.scalar()} rows")
-
-        print("\nEmbeddings:")
-        result = conn.execute(text("SELECT COUNT(*) FROM embeddings"))
-        print(f"- {result.scalar()} rows")
+        faq_count, recommendation_count, embedding_count = conn.execute(
+            _COUNT_QUERY
+        ).one()
+
+    print("\nFAQ Knowledge Base:")
+    print(f"- {faq_count} rows")
+
+    print("\nRecommendations Knowledge Base:")
+    print(f"- {recommendation_count} rows")
+
+    print("\nEmbeddings:")
+    print(f"- {embedding_count} rows")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,17 @@
 """Compare two batches of generated data to check for regressions."""
 
+import hashlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Set
+from typing import List, Set
 import pandas as pd
 import numpy as np
 
+# pandas can parse CSVs with pyarrow's multithreaded reader when it is installed
+_CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
 
 def load_dataset(path: Path) -> pd.DataFrame:
     """Load a CSV dataset and return as DataFrame.
@@ -16,53 +23,133 @@ def load_dataset(path: Path) -> pd.DataFrame:
         DataFrame containing the loaded data, or empty DataFrame if loading fails
     """
     try:
-        return pd.read_csv(path)
+        return pd.read_csv(path, engine=_CSV_ENGINE)
     except Exception as e:
         print(f"Error loading {path}: {str(e)}")
         return pd.DataFrame()
 
 
+def _file_digest(path: Path) -> bytes:
+    """Hash a file's contents in fixed-size chunks."""
+    digest = hashlib.blake2b()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def files_identical(path1: Path, path2: Path) -> bool:
+    """Check whether two files are byte-identical without parsing them.
+
+    Sizes are compared first so differing files are usually ruled out
+    without reading either one.
+    """
+    if path1.stat().st_size != path2.stat().st_size:
+        return False
+    return _file_digest(path1) == _file_digest(path2)
+
+
+def _percent_change(before: pd.Series, after: pd.Series):
+    """Get the difference and percentage change between two stat rows.
+
+    The percentage is infinite where the value before was zero.
+    """
+    diff = after - before
+    pct = (diff / before * 100).where(before != 0, np.inf)
+    return diff, pct
+
+
 def compare_numeric_stats(
     df1: pd.DataFrame, df2: pd.DataFrame, common_cols: Set[str]
-) -> None:
+) -> List[str]:
     """Compare numeric column statistics between two DataFrames.
 
     Args:
         df1: First DataFrame to compare
         df2: Second DataFrame to compare
         common_cols: Set of column names common to both DataFrames
+
+    Returns:
+        Report lines describing the changes, empty if there are no numeric columns
     """
-    numeric_cols = [
-        col for col in common_cols if np.issubdtype(df1[col].dtype, np.number)
-    ]
+    numeric_cols = df1.select_dtypes(include=np.number).columns.intersection(
+        list(common_cols)
+    )
 
-    if not numeric_cols:
-        return
+    if numeric_cols.empty:
+        return []
 
-    print("  📈 Numeric column changes:")
-    for col in numeric_cols:
-        stats1 = df1[col].describe()
-        stats2 = df2[col].describe()
+    # Describe all numeric columns at once, then compare the stats frames
+    stats1 = df1[numeric_cols].describe()
+    stats2 = df2[numeric_cols].describe()
 
-        mean_diff = stats2["mean"] - stats1["mean"]
-        mean_pct = (
-            (mean_diff / stats1["mean"]) * 100 if stats1["mean"] != 0 else float("inf")
-        )
+    mean_diff, mean_pct = _percent_change(stats1.loc["mean"], stats2.loc["mean"])
+    std_diff, std_pct = _percent_change(stats1.loc["std"], stats2.loc["std"])
 
-        std_diff = stats2["std"] - stats1["std"]
-        std_pct = (
-            (std_diff / stats1["std"]) * 100 if stats1["std"] != 0 else float("inf")
+    lines = ["  📈 Numeric column changes:"]
+    for col in numeric_cols:
+        lines.append(f"    {col}:")
+        lines.append(
+            f"      Mean: {stats1.at['mean', col]:.2f} → {stats2.at['mean', col]:.2f} "
+            f"({'↑' if mean_diff[col] > 0 else '↓'}{abs(mean_pct[col]):.1f}%)"
         )
-
-        print(f"    {col}:")
-        print(
-            f"      Mean: {stats1['mean']:.2f} → {stats2['mean']:.2f} "
-            f"({'↑' if mean_diff > 0 else '↓'}{abs(mean_pct):.1f}%)"
+        lines.append(
+            f"      Std:  {stats1.at['std', col]:.2f} → {stats2.at['std', col]:.2f} "
+            f"({'↑' if std_diff[col] > 0 else '↓'}{abs(std_pct[col]):.1f}%)"
         )
-        print(
-            f"      Std:  {stats1['std']:.2f} → {stats2['std']:.2f} "
-            f"({'↑' if std_diff > 0 else '↓'}{abs(std_pct):.1f}%)"
+    return lines
+
+
+def compare_file(file: str, batch1_path: Path, batch2_path: Path) -> str:
+    """Compare one CSV file present in both batches.
+
+    Args:
+        file: Name of the CSV file
+        batch1_path: Path to the first batch directory
+        batch2_path: Path to the second batch directory
+
+    Returns:
+        The formatted comparison report for the file
+    """
+    lines = [f"\n📊 {file}"]
+
+    # Skip parsing entirely when the file didn't change between batches
+    if files_identical(batch1_path / file, batch2_path / file):
+        lines.append("  ✅ Unchanged")
+        return "\n".join(lines)
+
+    df1 = load_dataset(batch1_path / file)
+    df2 = load_dataset(batch2_path / file)
+
+    if df1.empty or df2.empty:
+        return "\n".join(lines)
+
+    # Compare record counts
+    count1, count2 = len(df1), len(df2)
+    count_diff = count2 - count1
+    count_pct = (count_diff / count1) * 100 if count1 > 0 else float("inf")
+
+    lines.append(
+        f"  Records: {count1:,} → {count2:,} "
+        f"({'↑' if count_diff > 0 else '↓'}{abs(count_diff):,}, "
+        f"{abs(count_pct):.1f}%)"
+    )
+
+    # Compare columns
+    cols1, cols2 = set(df1.columns), set(df2.columns)
+    missing_cols = cols1 - cols2
+    new_cols = cols2 - cols1
+
+    if missing_cols:
+        lines.append(
+            "  ❌ Missing columns in batch2: " + ", ".join(sorted(missing_cols))
         )
+    if new_cols:
+        lines.append("  ✨ New columns in batch2: " + ", ".join(sorted(new_cols)))
+
+    # Compare numeric columns statistics
+    lines.extend(compare_numeric_stats(df1, df2, cols1 & cols2))
+    return "\n".join(lines)
 
 
 def compare_datasets(batch1_dir: str, batch2_dir: str) -> None:
@@ -97,37 +184,16 @@ def compare_datasets(batch1_dir: str, batch2_dir: str) -> None:
     common_files = batch1_files & batch2_files
     print(f"\n🔍 Comparing {len(common_files)} common files...")
 
-    for file in sorted(common_files):
-        print(f"\n📊 {file}")
-        df1 = load_dataset(batch1_path / file)
-        df2 = load_dataset(batch2_path / file)
-
-        if df1.empty or df2.empty:
-            continue
-
-        # Compare record counts
-        count1, count2 = len(df1), len(df2)
-        count_diff = count2 - count1
-        count_pct = (count_diff / count1) * 100 if count1 > 0 else float("inf")
-
-        print(
-            f"  Records: {count1:,} → {count2:,} "
-            f"({'↑' if count_diff > 0 else '↓'}{abs(count_diff):,}, "
-            f"{abs(count_pct):.1f}%)"
+    # Files are independent, so compare them in parallel; map keeps the order
+    with ProcessPoolExecutor() as executor:
+        reports = executor.map(
+            compare_file,
+            sorted(common_files),
+            repeat(batch1_path),
+            repeat(batch2_path),
         )
-
-        # Compare columns
-        cols1, cols2 = set(df1.columns), set(df2.columns)
-        missing_cols = cols1 - cols2
-        new_cols = cols2 - cols1
-
-        if missing_cols:
-            print("  ❌ Missing columns in batch2:", ", ".join(sorted(missing_cols)))
-        if new_cols:
-            print("  ✨ New columns in batch2:", ", ".join(sorted(new_cols)))
-
-        # Compare numeric columns statistics
-        compare_numeric_stats(df1, df2, cols1 & cols2)
+        for report in reports:
+            print(report)
 
 
 if __name__ == "__main__":
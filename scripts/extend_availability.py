@@ -1,94 +1,115 @@
-import os
+import io
 from datetime import datetime, timedelta
 import pandas as pd
 from dotenv import load_dotenv
-import psycopg2
+from psycopg2 import sql
+from blue_horizon.db.partitions import ensure_month_partitions
+from blue_horizon.db.pool import pg_connection
 from blue_horizon.data.generators.availability_generator import (
     generate_room_availability,
 )
 
 
+def read_dataframe(conn, query: str, parse_dates=None) -> pd.DataFrame:
+    """Fetch a query result as a DataFrame, streamed with COPY TO STDOUT.
+
+    Room numbers are kept as text, as stored in the database.
+    """
+    buffer = io.StringIO()
+    with conn.cursor() as cur:
+        cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", buffer)
+    buffer.seek(0)
+    return pd.read_csv(buffer, parse_dates=parse_dates, dtype={"room_number": str})
+
+
+def copy_dataframe(conn, table: str, df: pd.DataFrame):
+    """Bulk-load a DataFrame into a table with COPY FROM STDIN."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    copy_sql = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+        sql.Identifier(table),
+        sql.SQL(", ").join(map(sql.Identifier, df.columns)),
+    )
+    with conn.cursor() as cur:
+        cur.copy_expert(copy_sql.as_string(conn), buffer)
+
+
 def main():
     # Load environment variables
     load_dotenv()
 
-    # Get database connection details
-    db_url = os.getenv("DB_URL")
-    if not db_url:
-        raise ValueError("DB_URL environment variable is not set")
-
     try:
         # Connect to the database
         print("Connecting to Neon.tech database...")
-        conn = psycopg2.connect(db_url)
-
-        # Get current room details
-        print("Fetching room details...")
-        room_details_df = pd.read_sql(
-            """
-            SELECT DISTINCT ON (r.room_id)
-                r.room_id,
-                r.room_number,
-                r.max_occupancy,
-                r.base_rate,
-                r.max_rate,
-                r.status
-            FROM rooms r
-        """,
-            conn,
-        )
-
-        # Get existing bookings
-        print("Fetching existing bookings...")
-        bookings_df = pd.read_sql(
-            """
-            SELECT 
-                room_number,
-                check_in,
-                check_out
-            FROM room_bookings
-            WHERE check_out > CURRENT_DATE
-        """,
-            conn,
-        )
-
-        # Get the latest date in room_availability
-        latest_date = pd.read_sql(
-            """
-            SELECT MAX(date) as max_date 
-            FROM room_availability
-        """,
-            conn,
-        ).iloc[0]["max_date"]
-
-        # Generate new availability data starting from the latest date
-        print(f"Generating availability data from {latest_date}...")
-        new_availability_df = generate_room_availability(
-            room_details_df=room_details_df,
-            bookings_df=bookings_df,
-            start_date=latest_date,
-            days_ahead=30,  # Extend by 30 days
-        )
-
-        # Insert new availability data
-        print("Inserting new availability data...")
-        new_availability_df.to_sql(
-            "room_availability",
-            conn,
-            if_exists="append",
-            index=False,
-            method="multi",
-            chunksize=1000,
-        )
+        with pg_connection() as conn:
+            # Get current room details
+            print("Fetching room details...")
+            room_details_df = read_dataframe(
+                conn,
+                """
+                SELECT
+                    room_id,
+                    room_number,
+                    max_occupancy,
+                    base_rate,
+                    max_rate,
+                    status
+                FROM rooms
+            """,
+            )
+
+            # Get existing bookings
+            print("Fetching existing bookings...")
+            bookings_df = read_dataframe(
+                conn,
+                """
+                SELECT 
+                    room_number,
+                    check_in,
+                    check_out
+                FROM room_bookings
+                WHERE check_out > CURRENT_DATE
+            """,
+                parse_dates=["check_in", "check_out"],
+            )
+
+            # Get the latest date in room_availability
+            # The index lets MAX(date) read a single entry instead of scanning
+            with conn.cursor() as cur:
+                cur.execute(
+                    "CREATE INDEX IF NOT EXISTS room_avail_date_desc_idx "
+                    "ON room_availability (date DESC)"
+                )
+                cur.execute("SELECT MAX(date) FROM room_availability")
+                latest_date = cur.fetchone()[0]
+
+            # Generate new availability data starting from the latest date
+            print(f"Generating availability data from {latest_date}...")
+            new_availability_df = generate_room_availability(
+                room_details_df=room_details_df,
+                bookings_df=bookings_df,
+                start_date=latest_date,
+                days_ahead=30,  # Extend by 30 days
+            )
+
+            # Insert new availability data
+            print("Inserting new availability data...")
+            new_dates = pd.to_datetime(new_availability_df["date"])
+            ensure_month_partitions(
+                conn,
+                "room_availability",
+                new_dates.min().date(),
+                new_dates.max().date(),
+            )
+            copy_dataframe(conn, "room_availability", new_availability_df)
 
         print("Room availability extension completed successfully!")
 
     except Exception as e:
         print(f"Error extending room availability: {str(e)}")
         raise
-    finally:
-        if "conn" in locals():
-            conn.close()
 
 
 if __name__ == "__main__":
@@ -1,46 +1,58 @@
 """Script to remove trailing whitespace from Python files."""
 
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# File I/O dominates, so use more threads than cores
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
-def fix_file_whitespace(file_path: Path) -> None:
+_TRAILING_WHITESPACE_RE = re.compile(r'[^\S\n]+(?=\n|\Z)')
+_TRAILING_BLANK_LINES_RE = re.compile(r'\n*\Z')
+
+
+def fix_file_whitespace(file_path: Path) -> bool:
     """Remove trailing whitespace from a file.
 
     Args:
         file_path: Path to the file to fix
+
+    Returns:
+        bool: Whether the file was rewritten
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            original = f.read()
 
-        # Remove trailing whitespace from each line
-        fixed_lines = [line.rstrip() + '\n' for line in lines]
+        # Strip whitespace at the end of each line, then collapse trailing
+        # blank lines into a single final newline
+        fixed = _TRAILING_WHITESPACE_RE.sub('', original)
+        fixed = _TRAILING_BLANK_LINES_RE.sub('\n', fixed, count=1) if fixed.strip() else ''
 
-        # Remove any trailing newlines at end of file
-        while fixed_lines and fixed_lines[-1].isspace():
-            fixed_lines.pop()
-
-        # Add single newline at end of file if missing
-        if fixed_lines and not fixed_lines[-1].endswith('\n'):
-            fixed_lines[-1] += '\n'
+        # Leave files that are already clean untouched
+        if fixed == original:
+            return False
 
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.writelines(fixed_lines)
+            f.write(fixed)
 
         print(f"Fixed whitespace in {file_path}")
+        return True
     except Exception as e:
         print(f"Error processing {file_path}: {str(e)}")
+        return False
 
 
 def main():
     """Find and fix all Python files in the project."""
     project_root = Path(__file__).parent.parent
-    python_files = list(project_root.rglob("*.py"))
 
-    print(f"Found {len(python_files)} Python files")
-    for file_path in python_files:
-        fix_file_whitespace(file_path)
+    # Files are independent, so read and rewrite them concurrently
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(fix_file_whitespace, project_root.rglob("*.py")))
+
+    print(f"Checked {len(results)} Python files, fixed {sum(results)}")
 
 
 if __name__ == "__main__":
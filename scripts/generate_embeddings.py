@@ -2,175 +2,318 @@
 
 import os
 import json
-from typing import List, Dict, Any
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import Session
-from openai import OpenAI
+import asyncio
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import asyncpg
+import numpy as np
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 from tqdm import tqdm
 from sentence_transformers import SentenceTransformer
+from blue_horizon.db.pool import close_async_pool, get_async_pool
+from blue_horizon.db.vector import register_vector_codec
 
 # Force reload environment variables
 load_dotenv(override=True)
 
+# Texts sent per embeddings request
+EMBEDDING_BATCH_SIZE = 256
 
-def get_embedding_with_transformer(
-    model: SentenceTransformer, text: str
-) -> List[float]:
-    """Get embedding using SentenceTransformer model.
+# Embeddings requests allowed in flight at once, to stay within rate limits
+MAX_CONCURRENT_REQUESTS = 8
+
+# Texts encoded per forward pass by the SentenceTransformer fallback
+TRANSFORMER_BATCH_SIZE = 64
+
+# Embeddings written per COPY
+STORE_BATCH_SIZE = 500
+
+# Embedded batches waiting to be stored before producers pause
+QUEUE_SIZE = 4
+
+# Concurrent database writers, each on its own pooled connection
+NUM_WRITERS = 4
+
+
+@lru_cache(maxsize=1)
+def _get_fallback_model() -> SentenceTransformer:
+    """Load the local SentenceTransformer model once and reuse it."""
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+
+def get_embeddings_with_transformer(
+    model: SentenceTransformer, texts: List[str]
+) -> List[List[float]]:
+    """Get embeddings for many texts using SentenceTransformer model.
+
+    encode sorts the texts by length before batching, so each batch is
+    padded only to its own longest text, and returns them in input order.
 
     Args:
         model: SentenceTransformer model
-        text: Text to get embedding for
+        texts: Texts to get embeddings for
 
     Returns:
-        List of floats representing the embedding
+        List of embeddings, in the same order as the texts
     """
-    embedding = model.encode(text)
-    return embedding.tolist()
+    embeddings = model.encode(
+        texts,
+        batch_size=TRANSFORMER_BATCH_SIZE,
+        show_progress_bar=True,
+        convert_to_numpy=True,
+    )
+    return embeddings.tolist()
 
 
-def get_embedding(client: OpenAI, content: str, model: str) -> List[float]:
-    """Get embedding for text using OpenAI API with fallback to SentenceTransformer.
+async def get_embeddings(
+    client: AsyncOpenAI, contents: List[str], model: str
+) -> List[List[float]]:
+    """Get embeddings for a batch of texts using OpenAI API.
 
     Args:
         client: OpenAI client
-        content: Text to get embedding for
+        contents: Texts to get embeddings for
         model: OpenAI model to use
 
     Returns:
-        List of floats representing the embedding
+        List of embeddings, in the same order as the texts
     """
-    try:
-        response = client.embeddings.create(
-            model="text-embedding-3-small", input=content, encoding_format="float"
-        )
-        return response.data[0].embedding
-    except Exception as e:
-        print(
-            f"\nFalling back to SentenceTransformer due to OpenAI API error: {str(e)}"
-        )
-        transformer_model = SentenceTransformer("all-MiniLM-L6-v2")
-        return get_embedding_with_transformer(transformer_model, content)
-
-
-def store_embedding(
-    conn: Session,
-    content: str,
-    embedding: List[float],
-    meta_data: Dict[str, Any] = None,
+    response = await client.embeddings.create(
+        model="text-embedding-3-small", input=contents, encoding_format="float"
+    )
+    return [item.embedding for item in response.data]
+
+
+async def fill_queue(
+    client: AsyncOpenAI,
+    contents: List[str],
+    metas: List[Dict[str, Any]],
+    model: str,
+    semaphore: asyncio.Semaphore,
+    queue: asyncio.Queue,
+    desc: str,
 ) -> None:
-    """Store embedding in the database."""
-    # Convert embedding list to PostgreSQL vector format
-    vector_str = f"[{','.join(str(x) for x in embedding)}]"
-
-    # Convert meta_data to JSON string
-    meta_data_json = json.dumps(meta_data) if meta_data else None
-
-    # Insert into database
-    conn.execute(
-        text(
-            """
-        WITH input_data AS (
-            SELECT 
-                :content AS content,
-                cast(:embedding AS vector(1536)) AS embedding,
-                cast(:meta_data AS jsonb) AS meta_data
-        )
-        INSERT INTO embeddings (content, embedding, meta_data)
-        SELECT content, embedding, meta_data FROM input_data
+    """Embed texts in concurrent batches, queueing each batch's rows as it finishes.
+
+    If the OpenAI API fails, the texts not queued yet are embedded with the
+    local SentenceTransformer model instead, in a single encode call.
+
+    Args:
+        client: OpenAI client
+        contents: Texts to get embeddings for
+        metas: Metadata stored with each text
+        model: OpenAI model to use
+        semaphore: Limits how many requests are in flight at once
+        queue: Receives lists of (content, embedding, meta_data) rows
+        desc: Progress bar label
     """
-        ),
-        {"content": content, "embedding": vector_str, "meta_data": meta_data_json},
+    starts = range(0, len(contents), EMBEDDING_BATCH_SIZE)
+    queued = set()
+
+    async def embed_batch(start: int):
+        batch = slice(start, start + EMBEDDING_BATCH_SIZE)
+        async with semaphore:
+            embeddings = await get_embeddings(client, contents[batch], model)
+        await queue.put(list(zip(contents[batch], embeddings, metas[batch])))
+        queued.add(start)
+        progress.update()
+
+    with tqdm(total=len(starts), desc=desc) as progress:
+        tasks = [asyncio.create_task(embed_batch(start)) for start in starts]
+        try:
+            await asyncio.gather(*tasks)
+            return
+        except Exception as e:
+            print(
+                "\nFalling back to SentenceTransformer due to OpenAI API error: "
+                f"{str(e)}"
+            )
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    remaining = [
+        i
+        for start in starts
+        if start not in queued
+        for i in range(start, min(start + EMBEDDING_BATCH_SIZE, len(contents)))
+    ]
+    remaining_contents = [contents[i] for i in remaining]
+    # The local model is CPU-bound, so keep it off the event loop
+    embeddings = await asyncio.to_thread(
+        get_embeddings_with_transformer, _get_fallback_model(), remaining_contents
+    )
+    await queue.put(
+        list(zip(remaining_contents, embeddings, (metas[i] for i in remaining)))
     )
-    conn.commit()
 
 
-def main():
-    """Generate and store embeddings."""
-    # Load environment variables
-    load_dotenv()
+async def drain_queue(pool: asyncpg.Pool, queue: asyncio.Queue) -> None:
+    """Store queued embedding rows in batches until a None sentinel arrives.
+
+    Each writer borrows its own connection, so several can run at once, and
+    writes all of its rows in one transaction.
+
+    Args:
+        pool: Pool to borrow the database connection from
+        queue: Lists of (content, embedding, meta_data) rows, then None
+    """
+    buffer = []
+    async with pool.acquire() as conn:
+        await register_vector_codec(conn)
+        async with conn.transaction():
+            while (rows := await queue.get()) is not None:
+                buffer.extend(rows)
+                while len(buffer) >= STORE_BATCH_SIZE:
+                    await store_embeddings(conn, buffer[:STORE_BATCH_SIZE])
+                    buffer = buffer[STORE_BATCH_SIZE:]
+            if buffer:
+                await store_embeddings(conn, buffer)
+
 
+async def store_embeddings(
+    conn: asyncpg.Connection,
+    rows: List[Tuple[str, List[float], Optional[Dict[str, Any]]]],
+) -> None:
+    """Store a batch of embeddings in the database with binary COPY.
+
+    The connection must have the vector codec registered, so embeddings
+    are sent as float32 arrays rather than formatted as text.
+
+    Args:
+        conn: Database connection
+        rows: (content, embedding, meta_data) tuples to insert
+    """
+    await conn.copy_records_to_table(
+        "embeddings",
+        records=[
+            (
+                content,
+                np.asarray(embedding, dtype=np.float32),
+                # Convert meta_data to JSON string
+                json.dumps(meta_data) if meta_data else None,
+            )
+            for content, embedding, meta_data in rows
+        ],
+        columns=["content", "embedding", "meta_data"],
+    )
+
+
+async def main():
+    """Generate and store embeddings."""
     # Initialize OpenAI client with API key
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
     model = os.getenv("OPENAI_MODEL", "text-embedding-3-small")
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
     print(f"\nUsing OpenAI model: {model}")
 
-    # Create database connection
-    db_url = (
-        f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
-        f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-    )
-    engine = create_engine(db_url)
-
-    with engine.connect() as conn:
-        # Process FAQs
-        print("\nProcessing FAQs...")
-        faqs = conn.execute(
-            text(
+    try:
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            print("\nFetching FAQs and recommendations...")
+            faqs = await conn.fetch(
                 """
                 SELECT faq_id, question, answer, category, subcategory
                 FROM faq_knowledge_base
                 """
             )
-        ).fetchall()
-
-        for faq in tqdm(faqs, desc="Generating FAQ embeddings"):
-            # Combine question and answer for embedding
-            content = f"Question: {faq.question}\nAnswer: {faq.answer}"
-            embedding = get_embedding(client, content, model)
-
-            # Store embedding with metadata
-            store_embedding(
-                conn,
-                content,
-                embedding,
-                {
-                    "type": "faq",
-                    "faq_id": faq.faq_id,
-                    "category": faq.category,
-                    "subcategory": faq.subcategory,
-                },
-            )
-
-        # Process recommendations
-        print("\nProcessing recommendations...")
-        recommendations = conn.execute(
-            text(
+            recommendations = await conn.fetch(
                 """
                 SELECT recommendation_id, name, description, category,
                        price_range, rating, distance_km
                 FROM recommendations_knowledge_base
                 """
             )
-        ).fetchall()
 
-        for rec in tqdm(recommendations, desc="Generating recommendation embeddings"):
-            # Combine name and description for embedding
-            content = f"{rec.name}\n{rec.description}"
-            embedding = get_embedding(client, content, model)
+            # Combine question and answer for embedding
+            faq_contents = [
+                f"Question: {faq['question']}\nAnswer: {faq['answer']}" for faq in faqs
+            ]
+            faq_metas = [
+                {
+                    "type": "faq",
+                    "faq_id": faq["faq_id"],
+                    "category": faq["category"],
+                    "subcategory": faq["subcategory"],
+                }
+                for faq in faqs
+            ]
 
-            # Store embedding with metadata
-            store_embedding(
-                conn,
-                content,
-                embedding,
+            # Combine name and description for embedding
+            rec_contents = [
+                f"{rec['name']}\n{rec['description']}" for rec in recommendations
+            ]
+            rec_metas = [
                 {
                     "type": "recommendation",
-                    "recommendation_id": rec.recommendation_id,
-                    "category": rec.category,
-                    "price_range": rec.price_range,
-                    "rating": rec.rating,
-                    "distance_km": rec.distance_km,
-                },
+                    "recommendation_id": rec["recommendation_id"],
+                    "category": rec["category"],
+                    "price_range": rec["price_range"],
+                    "rating": rec["rating"],
+                    "distance_km": rec["distance_km"],
+                }
+                for rec in recommendations
+            ]
+
+        # Embedding requests and database writes overlap: producers queue
+        # rows as each batch is embedded while several writers copy them
+        # into the database on their own connections. The bounded queue
+        # keeps producers from running far ahead of the writes.
+        print("\nGenerating and storing embeddings...")
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+        async def produce():
+            # Both knowledge bases share the semaphore, so their requests
+            # interleave without exceeding the concurrency limit
+            await asyncio.gather(
+                fill_queue(
+                    client,
+                    faq_contents,
+                    faq_metas,
+                    model,
+                    semaphore,
+                    queue,
+                    "Generating FAQ embeddings",
+                ),
+                fill_queue(
+                    client,
+                    rec_contents,
+                    rec_metas,
+                    model,
+                    semaphore,
+                    queue,
+                    "Generating recommendation embeddings",
+                ),
             )
+            # One sentinel per writer
+            for _ in range(NUM_WRITERS):
+                await queue.put(None)
 
-        # Commit all changes
-        conn.execute(text("COMMIT"))
+        # If any task fails, cancel the rest: writers roll back and hand
+        # their connections back to the pool instead of waiting forever for
+        # a sentinel, and producers stop waiting on a queue nobody drains
+        tasks = [
+            asyncio.create_task(produce()),
+            *(
+                asyncio.create_task(drain_queue(pool, queue))
+                for _ in range(NUM_WRITERS)
+            ),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await close_async_pool()
 
     print("\nEmbedding generation completed!")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
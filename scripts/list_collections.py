@@ -28,7 +28,8 @@ def main():
 
         # Get a sample of documents
         try:
-            results = collection.get(limit=1)
+            # Only fetch the fields printed below, never the embedding vectors
+            results = collection.get(limit=1, include=["documents", "metadatas"])
             if results and results["documents"]:
                 print("\nSample document:")
                 print(
@@ -1,213 +1,356 @@
 """Script to migrate data from local PostgreSQL to Neon.tech."""
 
 import os
+import re
 import asyncio
+from typing import List
 import asyncpg
-from tqdm import tqdm
 from dotenv import load_dotenv
+from blue_horizon.db.config import get_db_config
+from blue_horizon.db.vector import register_vector_codec
 
 # Load environment variables
 load_dotenv(override=True)
 
-# Tables to migrate in order of dependencies
+# Tables to migrate, in tiers ordered by dependencies. Tables within a tier
+# don't depend on each other and are migrated concurrently.
 TABLES_TO_MIGRATE = [
     # Base tables (no dependencies)
-    "customers",
-    "amenities",
-    "rooms",
-    "staff",
-    "services",
-    "event_spaces",
-    "restaurants",
-    "promotions",
+    [
+        "customers",
+        "amenities",
+        "rooms",
+        "staff",
+        "services",
+        "event_spaces",
+        "restaurants",
+        "promotions",
+    ],
     # First level dependencies
-    "customer_preferences",
-    "customer_history",
-    "room_availability",
-    "room_bookings",
-    "restaurant_bookings",
-    "event_bookings",
-    "event_space_bookings",
-    "staff_schedules",
-    "service_appointments",
+    [
+        "customer_preferences",
+        "customer_history",
+        "room_availability",
+        "room_bookings",
+        "restaurant_bookings",
+        "event_bookings",
+        "event_space_bookings",
+        "staff_schedules",
+        "service_appointments",
+    ],
     # Second level dependencies
-    "payments",
-    "feedback",
-    "maintenance",
-    "amenity_usage",
+    [
+        "payments",
+        "feedback",
+        "maintenance",
+        "amenity_usage",
+    ],
     # Knowledge base and tracking
-    "embeddings",
-    "faqs",
-    "faq_knowledge_base",
-    "recommendations",
-    "recommendations_knowledge_base",
-    "event_tracking",
+    [
+        "embeddings",
+        "faqs",
+        "faq_knowledge_base",
+        "recommendations",
+        "recommendations_knowledge_base",
+        "event_tracking",
+    ],
 ]
 
+# Connections per database, one per table migrated at the same time
+POOL_SIZE = 8
 
-async def get_local_connection():
-    """Get connection to local PostgreSQL database."""
-    return await asyncpg.connect(
-        host="localhost",
-        port=5432,
-        user=os.getenv("LOCAL_DB_USER", "postgres"),
-        password=os.getenv("LOCAL_DB_PASSWORD", "postgres"),
-        database=os.getenv("LOCAL_DB_NAME", "blue_horizon"),
-    )
+# Rows fetched from the local database and copied to Neon at a time
+BATCH_SIZE = 10000
 
+# Batches read ahead from the local database while earlier ones are copied
+QUEUE_SIZE = 8
 
-async def get_neon_connection():
-    """Get connection to Neon database."""
-    return await asyncpg.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=os.getenv("DB_PORT", "5432"),
-        user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD", "postgres"),
-        database=os.getenv("DB_NAME", "blue_horizon"),
-    )
+# Sequence name in a serial column's default, e.g. nextval('users_id_seq'::regclass)
+_SEQUENCE_RE = re.compile(r"nextval\('([^']+)'")
 
+# asyncpg caches the prepared statement per connection, so keeping the query
+# text identical lets every table after the first on a connection reuse it
+_SCHEMA_QUERY = """
+    SELECT column_name, data_type, character_maximum_length,
+           is_nullable, column_default, udt_name
+    FROM information_schema.columns
+    WHERE table_name = $1
+    ORDER BY ordinal_position
+"""
 
-async def migrate_table(table_name: str, local_conn, neon_conn):
-    """Migrate a table from local PostgreSQL to Neon.tech.
+
+async def copy_rows(neon_conn, table_name: str, columns: List[str], records):
+    """Bulk-load rows into a Neon table, skipping rows that already exist.
+
+    Rows are sent with binary COPY into a temporary staging table, then
+    merged with INSERT ... ON CONFLICT DO NOTHING so reruns stay idempotent.
 
     Args:
-        table_name: Name of the table to migrate
-        local_conn: Local database connection
         neon_conn: Neon database connection
+        table_name: Name of the destination table
+        columns: Column names, in the order of the record fields
+        records: Rows to load
     """
-    print(f"\nMigrating {table_name}...")
-
-    try:
-        # Get table schema
-        schema = await local_conn.fetch(
-            """
-            SELECT column_name, data_type, character_maximum_length, 
-                   is_nullable, column_default, udt_name
-            FROM information_schema.columns 
-            WHERE table_name = $1
-            ORDER BY ordinal_position
-            """,
-            table_name,
+    staging_table = f"_staging_{table_name}"
+    columns_str = ",".join(columns)
+    async with neon_conn.transaction():
+        await neon_conn.execute(
+            f"CREATE TEMP TABLE {staging_table} (LIKE {table_name}) ON COMMIT DROP"
         )
-
-        if not schema:
-            print(f"Table {table_name} not found in local database!")
-            return
-
-        # Create sequences first
-        for col in schema:
-            if col["column_default"] and "nextval" in col["column_default"]:
-                seq_name = col["column_default"].split("'")[1].split("::")[0]
-                try:
-                    await neon_conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {seq_name}")
-                except Exception as e:
-                    print(f"Warning: Could not create sequence {seq_name}: {str(e)}")
-
-        # Create table in Neon if it doesn't exist
-        columns = []
-        for col in schema:
-            # Handle special data types
-            if col["udt_name"] == "vector":
-                col_type = "vector(1536)"
-            elif col["data_type"].startswith("ARRAY"):
-                # Extract the base type from udt_name (e.g., "_text" -> "text[]")
-                base_type = (
-                    col["udt_name"][1:]
-                    if col["udt_name"].startswith("_")
-                    else col["udt_name"]
-                )
-                col_type = f"{base_type}[]"
-            else:
-                col_type = col["data_type"]
-                if col["character_maximum_length"]:
-                    col_type = f"{col_type}({col['character_maximum_length']})"
-
-            nullable = "NOT NULL" if col["is_nullable"] == "NO" else ""
-            default = (
-                f"DEFAULT {col['column_default']}" if col["column_default"] else ""
-            )
-            columns.append(
-                f"{col['column_name']} {col_type} {nullable} {default}".strip()
-            )
-
-        create_table_sql = f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            {','.join(columns)}
+        await neon_conn.copy_records_to_table(
+            staging_table, records=records, columns=columns
         )
-        """
-        await neon_conn.execute(create_table_sql)
-
-        # Get data from local database
-        data = await local_conn.fetch(f"SELECT * FROM {table_name}")
-        if not data:
-            print(f"No data found in {table_name}")
-            return
-
-        print(f"Found {len(data)} rows to migrate")
-
-        # Migrate data in batches
-        batch_size = 1000
-        for i in tqdm(range(0, len(data), batch_size), desc=f"Migrating {table_name}"):
-            batch = data[i : i + batch_size]
-
-            # Generate placeholders for the INSERT statement
-            placeholders = []
-            values = []
-            for row in batch:
-                row_placeholders = []
-                for j, val in enumerate(row, start=1):
-                    values.append(val)
-                    row_placeholders.append(f"${len(values)}")
-                placeholders.append(f"({','.join(row_placeholders)})")
-
-            # Insert batch into Neon
-            columns_str = ",".join(col["column_name"] for col in schema)
-            insert_sql = f"""
+        await neon_conn.execute(
+            f"""
             INSERT INTO {table_name} ({columns_str})
-            VALUES {','.join(placeholders)}
+            SELECT {columns_str} FROM {staging_table}
             ON CONFLICT DO NOTHING
             """
-            await neon_conn.execute(insert_sql, *values)
+        )
+
+
+def _local_connect_kwargs():
+    """Get the connection settings for the local PostgreSQL database."""
+    return {
+        "host": "localhost",
+        "port": 5432,
+        "user": os.getenv("LOCAL_DB_USER", "postgres"),
+        "password": os.getenv("LOCAL_DB_PASSWORD", "postgres"),
+        "database": os.getenv("LOCAL_DB_NAME", "blue_horizon"),
+    }
+
+
+def _neon_connect_kwargs():
+    """Get the connection settings for the Neon database."""
+    return get_db_config().connect_kwargs()
+
+
+async def get_local_pool():
+    """Get a connection pool for the local PostgreSQL database."""
+    return await asyncpg.create_pool(
+        min_size=1,
+        max_size=POOL_SIZE,
+        init=register_vector_codec,
+        **_local_connect_kwargs(),
+    )
+
+
+async def get_neon_pool():
+    """Get a connection pool for the Neon database.
+
+    The vector extension must already exist, since each new connection
+    registers the vector codec.
+    """
+    return await asyncpg.create_pool(
+        min_size=1,
+        max_size=POOL_SIZE,
+        init=register_vector_codec,
+        **_neon_connect_kwargs(),
+    )
+
+
+async def drop_vector_indexes(neon_conn, table_name: str) -> List[str]:
+    """Drop a Neon table's vector indexes, returning their definitions.
+
+    Args:
+        neon_conn: Neon database connection
+        table_name: Name of the table whose HNSW/ivfflat indexes to drop
+
+    Returns:
+        CREATE INDEX statements to rebuild the dropped indexes
+    """
+    indexes = await neon_conn.fetch(
+        """
+        SELECT indexname, indexdef
+        FROM pg_indexes
+        WHERE schemaname = 'public' AND tablename = $1
+          AND indexdef ~ 'USING (hnsw|ivfflat)'
+        """,
+        table_name,
+    )
+    for index in indexes:
+        await neon_conn.execute(f"DROP INDEX IF EXISTS {index['indexname']}")
+    return [index["indexdef"] for index in indexes]
 
-        # Verify row count
-        neon_count = await neon_conn.fetchval(f"SELECT COUNT(*) FROM {table_name}")
-        print(f"Migrated {neon_count} rows to {table_name}")
 
+async def read_batches(local_conn, table_name: str, queue: asyncio.Queue):
+    """Read a local table through a cursor and queue its rows in batches.
+
+    A None sentinel is queued after the last batch. If reading fails, the
+    exception is queued instead, for the consumer to raise.
+
+    Args:
+        local_conn: Local database connection
+        table_name: Name of the table to read
+        queue: Receives lists of at most BATCH_SIZE records
+    """
+    try:
+        batch = []
+        async with local_conn.transaction():
+            async for row in local_conn.cursor(
+                f"SELECT * FROM {table_name}", prefetch=BATCH_SIZE
+            ):
+                batch.append(row)
+                if len(batch) == BATCH_SIZE:
+                    await queue.put(batch)
+                    batch = []
+        if batch:
+            await queue.put(batch)
+        await queue.put(None)
     except Exception as e:
-        print(f"Error migrating {table_name}: {str(e)}")
-        raise
+        await queue.put(e)
+
+
+async def migrate_table(table_name: str, local_pool, neon_pool):
+    """Migrate a table from local PostgreSQL to Neon.tech.
+
+    Args:
+        table_name: Name of the table to migrate
+        local_pool: Local database connection pool
+        neon_pool: Neon database connection pool
+    """
+    print(f"\nMigrating {table_name}...")
 
+    async with local_pool.acquire() as local_conn, neon_pool.acquire() as neon_conn:
+
+        try:
+            # Get table schema
+            schema = await local_conn.fetch(_SCHEMA_QUERY, table_name)
+
+            if not schema:
+                print(f"Table {table_name} not found in local database!")
+                return
+
+            # Create sequences first
+            for col in schema:
+                match = _SEQUENCE_RE.search(col["column_default"] or "")
+                if match:
+                    seq_name = match.group(1)
+                    try:
+                        await neon_conn.execute(
+                            f"CREATE SEQUENCE IF NOT EXISTS {seq_name}"
+                        )
+                    except Exception as e:
+                        print(
+                            f"Warning: Could not create sequence {seq_name}: {str(e)}"
+                        )
+
+            # Create table in Neon if it doesn't exist
+            columns = []
+            for col in schema:
+                # Handle special data types
+                if col["udt_name"] == "vector":
+                    col_type = "vector(1536)"
+                elif col["data_type"].startswith("ARRAY"):
+                    # Extract the base type from udt_name (e.g., "_text" -> "text[]")
+                    base_type = (
+                        col["udt_name"][1:]
+                        if col["udt_name"].startswith("_")
+                        else col["udt_name"]
+                    )
+                    col_type = f"{base_type}[]"
+                else:
+                    col_type = col["data_type"]
+                    if col["character_maximum_length"]:
+                        col_type = f"{col_type}({col['character_maximum_length']})"
+
+                nullable = "NOT NULL" if col["is_nullable"] == "NO" else ""
+                default = (
+                    f"DEFAULT {col['column_default']}" if col["column_default"] else ""
+                )
+                columns.append(
+                    f"{col['column_name']} {col_type} {nullable} {default}".strip()
+                )
 
-async def verify_migration(local_conn, neon_conn):
+            create_table_sql = f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                {','.join(columns)}
+            )
+            """
+            await neon_conn.execute(create_table_sql)
+
+            # Vector indexes on the target (e.g. on embeddings) are rebuilt
+            # once after the copy instead of being updated for every row
+            vector_index_defs = []
+            if any(col["udt_name"] == "vector" for col in schema):
+                vector_index_defs = await drop_vector_indexes(neon_conn, table_name)
+
+            # Stream rows from the local database and copy them to Neon in
+            # batches, so memory use doesn't grow with the table size. The
+            # read runs as its own task, so the next batch is fetched while
+            # the previous one is being copied.
+            column_names = [col["column_name"] for col in schema]
+            row_count = 0
+            queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+            reader = asyncio.create_task(read_batches(local_conn, table_name, queue))
+            try:
+                while (batch := await queue.get()) is not None:
+                    if isinstance(batch, Exception):
+                        raise batch
+                    await copy_rows(neon_conn, table_name, column_names, batch)
+                    row_count += len(batch)
+            finally:
+                reader.cancel()
+                await asyncio.gather(reader, return_exceptions=True)
+                for index_def in vector_index_defs:
+                    print(f"Rebuilding vector index on {table_name}...")
+                    await neon_conn.execute(index_def)
+
+            if not row_count:
+                print(f"No data found in {table_name}")
+                return
+
+            print(f"Copied {row_count} rows from {table_name}")
+
+            # Verify row count
+            neon_count = await neon_conn.fetchval(f"SELECT COUNT(*) FROM {table_name}")
+            print(f"Migrated {neon_count} rows to {table_name}")
+
+        except Exception as e:
+            print(f"Error migrating {table_name}: {str(e)}")
+            raise
+
+
+async def verify_migration(local_pool, neon_pool):
     """Verify that all tables were migrated successfully."""
     print("\nVerifying migration...")
 
-    for table in TABLES_TO_MIGRATE:
-        local_count = await local_conn.fetchval(f"SELECT COUNT(*) FROM {table}")
-        neon_count = await neon_conn.fetchval(f"SELECT COUNT(*) FROM {table}")
-        print(f"- {table}: {local_count} rows (local) -> {neon_count} rows (Neon)")
+    async with local_pool.acquire() as local_conn, neon_pool.acquire() as neon_conn:
+        for tier in TABLES_TO_MIGRATE:
+            for table in tier:
+                local_count = await local_conn.fetchval(f"SELECT COUNT(*) FROM {table}")
+                neon_count = await neon_conn.fetchval(f"SELECT COUNT(*) FROM {table}")
+                print(
+                    f"- {table}: {local_count} rows (local) -> {neon_count} rows (Neon)"
+                )
 
 
 async def main():
     """Run the migration."""
     try:
+        # Enable vector extension in Neon
+        print("Enabling vector extension in Neon.tech...")
+        neon_conn = await asyncpg.connect(**_neon_connect_kwargs())
+        try:
+            await neon_conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        finally:
+            await neon_conn.close()
+
         # Connect to databases
         print("Connecting to local PostgreSQL database...")
-        local_conn = await get_local_connection()
+        local_pool = await get_local_pool()
 
         print("Connecting to Neon.tech database...")
-        neon_conn = await get_neon_connection()
-
-        # Enable vector extension in Neon
-        print("Enabling vector extension in Neon.tech...")
-        await neon_conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        neon_pool = await get_neon_pool()
 
-        # Migrate tables in order
-        for table in TABLES_TO_MIGRATE:
-            await migrate_table(table, local_conn, neon_conn)
+        # Migrate tiers in order, and the tables within each tier concurrently
+        for tier in TABLES_TO_MIGRATE:
+            await asyncio.gather(
+                *(migrate_table(table, local_pool, neon_pool) for table in tier)
+            )
 
         # Verify migration
-        await verify_migration(local_conn, neon_conn)
+        await verify_migration(local_pool, neon_pool)
 
         print("\nMigration completed successfully!")
 
@@ -215,10 +358,10 @@ async def main():
         print(f"Error during migration: {str(e)}")
         raise
     finally:
-        if "local_conn" in locals():
-            await local_conn.close()
-        if "neon_conn" in locals():
-            await neon_conn.close()
+        if "local_pool" in locals():
+            await local_pool.close()
+        if "neon_pool" in locals():
+            await neon_pool.close()
 
 
 if __name__ == "__main__":
@@ -7,6 +7,28 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Vector indexes on the destination tables. They are dropped during the
+# migration and rebuilt afterwards, which is much cheaper than updating
+# them for every inserted row.
+_VECTOR_INDEXES = {
+    "faqs_embedding_idx": """
+        CREATE INDEX IF NOT EXISTS faqs_embedding_idx
+        ON faqs USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """,
+    "recommendations_embedding_idx": """
+        CREATE INDEX IF NOT EXISTS recommendations_embedding_idx
+        ON recommendations USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """,
+}
+
+# Speed up the bulk insert and index builds for this transaction only
+_BULK_LOAD_SETTINGS = (
+    "SET LOCAL synchronous_commit = off",
+    "SET LOCAL maintenance_work_mem = '1GB'",
+)
+
 
 def get_db_connection():
     """Get database connection."""
@@ -89,10 +111,20 @@ def main():
                     print("Old tables not found. Nothing to migrate.")
                     return
 
-                # Migrate data
+                for setting in _BULK_LOAD_SETTINGS:
+                    conn.execute(text(setting))
+
+                # Migrate data without maintaining the vector indexes
+                for index_name in _VECTOR_INDEXES:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
                 migrate_faqs(conn)
                 migrate_recommendations(conn)
 
+                print("Rebuilding vector indexes...")
+                for create_index_sql in _VECTOR_INDEXES.values():
+                    conn.execute(text(create_index_sql))
+
                 print("\nVerifying migration...")
                 # Get counts
                 faq_count = conn.execute(text("SELECT COUNT(*) FROM faqs")).scalar()
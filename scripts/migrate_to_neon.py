@@ -1,217 +1,402 @@
-"""Script to migrate vector data from ChromaDB to Neon.tech."""
+"""Script to migrate vector data from ChromaDB to Neon.tech.
+
+Empty tables are filled with plain COPY; tables that already hold rows are
+upserted, so the migration is safe to re-run. That is why its session
+commits without waiting for the WAL flush: a crash can at worst lose the
+last few commits, which the next run writes again.
+"""
 
-import os
 from pathlib import Path
+import argparse
 import asyncio
+from typing import Any, Dict, Optional, Tuple
 import asyncpg
 from tqdm import tqdm
 from dotenv import load_dotenv
 import chromadb
 from chromadb.config import Settings
+from blue_horizon.db.config import get_db_config
 
 # Load environment variables
 load_dotenv(override=True)
 
+# Documents read from ChromaDB and loaded into Neon at a time
+PAGE_SIZE = 2000
+
+# Pages read ahead from ChromaDB while earlier ones are loaded
+QUEUE_SIZE = 4
+
+# Columns copied from ChromaDB, in the order of the row tuples built below
+_FAQ_COLUMNS = [
+    "faq_id",
+    "category",
+    "subcategory",
+    "question",
+    "answer",
+    "keywords",
+    "helpful_votes",
+    "views",
+]
+_RECOMMENDATION_COLUMNS = [
+    "recommendation_id",
+    "category",
+    "name",
+    "description",
+    "address",
+    "distance_km",
+    "price_range",
+    "rating",
+    "review_count",
+    "tags",
+    "keywords",
+    "booking_required",
+    "seasonal",
+]
+
+# Field prefixes used in the "Field: value" lines of ChromaDB documents, and
+# the metadata keys that hold the same values when the writer stored them
+_DOCUMENT_FIELDS = {
+    "Category": "category",
+    "Subcategory": "subcategory",
+    "Question": "question",
+    "Answer": "answer",
+    "Name": "name",
+    "Description": "description",
+    "Tags": "tags",
+    "Price Range": "price_range",
+}
+
+# Document fields each table's rows are built from
+_FAQ_FIELDS = ("Category", "Subcategory", "Question", "Answer")
+_RECOMMENDATION_FIELDS = ("Category", "Name", "Description", "Tags", "Price Range")
+
+# Merge the staged rows into the target tables, stamping them with NOW().
+# If an id appears more than once, the last copied row wins, as it did when
+# each row was upserted separately.
+_FAQ_UPSERT_SQL = """
+    INSERT INTO faq_knowledge_base (
+        faq_id, category, subcategory, question, answer, keywords,
+        last_updated, helpful_votes, views
+    )
+    SELECT DISTINCT ON (faq_id)
+           faq_id, category, subcategory, question, answer, keywords,
+           NOW(), helpful_votes, views
+    FROM staging_faq_knowledge_base
+    ORDER BY faq_id, ctid DESC
+    ON CONFLICT (faq_id) DO UPDATE SET
+        category = EXCLUDED.category,
+        subcategory = EXCLUDED.subcategory,
+        question = EXCLUDED.question,
+        answer = EXCLUDED.answer,
+        keywords = EXCLUDED.keywords,
+        last_updated = EXCLUDED.last_updated,
+        helpful_votes = EXCLUDED.helpful_votes,
+        views = EXCLUDED.views
+"""
+_RECOMMENDATION_UPSERT_SQL = """
+    INSERT INTO recommendations_knowledge_base (
+        recommendation_id, category, name, description, address, distance_km,
+        price_range, rating, review_count, tags, keywords, last_verified,
+        booking_required, seasonal
+    )
+    SELECT DISTINCT ON (recommendation_id)
+           recommendation_id, category, name, description, address, distance_km,
+           price_range, rating, review_count, tags, keywords, NOW(),
+           booking_required, seasonal
+    FROM staging_recommendations_knowledge_base
+    ORDER BY recommendation_id, ctid DESC
+    ON CONFLICT (recommendation_id) DO UPDATE SET
+        category = EXCLUDED.category,
+        name = EXCLUDED.name,
+        description = EXCLUDED.description,
+        address = EXCLUDED.address,
+        distance_km = EXCLUDED.distance_km,
+        price_range = EXCLUDED.price_range,
+        rating = EXCLUDED.rating,
+        review_count = EXCLUDED.review_count,
+        tags = EXCLUDED.tags,
+        keywords = EXCLUDED.keywords,
+        last_verified = EXCLUDED.last_verified,
+        booking_required = EXCLUDED.booking_required,
+        seasonal = EXCLUDED.seasonal
+"""
+
 
 async def get_neon_connection():
-    """Get connection to Neon database."""
+    """Get connection to Neon database, with synchronous_commit off."""
     return await asyncpg.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=os.getenv("DB_PORT", "5432"),
-        user=os.getenv("DB_USER", "postgres"),
-        password=os.getenv("DB_PASSWORD", "postgres"),
-        database=os.getenv("DB_NAME", "blue_horizon"),
+        **get_db_config().connect_kwargs(),
+        server_settings={"synchronous_commit": "off"},
+    )
+
+
+def parse_document(text: str) -> Dict[str, str]:
+    """Split a ChromaDB document of "Field: value" lines into a dict.
+
+    Lines without a known field prefix are ignored; if a field repeats,
+    its first value is kept.
+    """
+    fields = {}
+    for line in text.split("\n"):
+        field, sep, value = line.partition(": ")
+        if sep and field in _DOCUMENT_FIELDS:
+            fields.setdefault(field, value)
+    return fields
+
+
+def get_document_fields(
+    text: str, metadata: Dict[str, Any], names: Tuple[str, ...]
+) -> Dict[str, Any]:
+    """Get a document's fields, preferring its metadata over its text.
+
+    The text is only parsed when some of the fields are missing from the
+    metadata.
+
+    Args:
+        text: ChromaDB document of "Field: value" lines
+        metadata: The document's ChromaDB metadata
+        names: Field names to look up, as used in the document text
+    """
+    fields = {
+        name: metadata[_DOCUMENT_FIELDS[name]]
+        for name in names
+        if _DOCUMENT_FIELDS[name] in metadata
+    }
+    if len(fields) < len(names):
+        for name, value in parse_document(text).items():
+            fields.setdefault(name, value)
+    return fields
+
+
+async def copy_rows(conn, table_name: str, columns, rows):
+    """Bulk-load rows straight into a table with COPY.
+
+    Only safe when none of the rows exist yet: there is no conflict
+    handling, so a duplicate key fails the whole batch.
+
+    Args:
+        conn: Database connection
+        table_name: Name of target Neon.tech table
+        columns: Column names, in the order of the row tuples
+        rows: Row tuples to load
+    """
+    await conn.copy_records_to_table(table_name, records=rows, columns=columns)
+
+
+async def detect_mode(conn, table_name: str) -> str:
+    """Pick "initial" for an empty table and "upsert" otherwise."""
+    has_rows = await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {table_name})")
+    return "upsert" if has_rows else "initial"
+
+
+async def prepare_upsert(conn, table_name: str, upsert_sql: str):
+    """Create the staging table for a target table and prepare its upsert.
+
+    The temporary staging_<table_name> table lives for the session and is
+    emptied at every commit, so one prepared statement serves every page.
+
+    Args:
+        conn: Database connection
+        table_name: Name of target Neon.tech table
+        upsert_sql: INSERT ... SELECT ... ON CONFLICT statement reading
+            from the staging table
+    """
+    await conn.execute(
+        f"CREATE TEMP TABLE IF NOT EXISTS staging_{table_name} "
+        f"(LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+    )
+    return await conn.prepare(upsert_sql)
+
+
+async def upsert_rows(conn, table_name: str, columns, rows, upsert):
+    """Bulk-load rows into a table with COPY, updating rows that already exist.
+
+    Rows are copied into the staging_<table_name> table in one stream, then
+    merged into the target table with a single upsert.
+
+    Args:
+        conn: Database connection
+        table_name: Name of target Neon.tech table
+        columns: Column names, in the order of the row tuples
+        rows: Row tuples to load
+        upsert: Prepared statement from prepare_upsert
+    """
+    async with conn.transaction():
+        await conn.copy_records_to_table(
+            f"staging_{table_name}", records=rows, columns=columns
+        )
+        await upsert.fetch()
+
+
+def build_faq_row(text: str, metadata: Dict[str, Any]) -> Tuple:
+    """Build a faq_knowledge_base row from a ChromaDB document."""
+    fields = get_document_fields(text, metadata, _FAQ_FIELDS)
+    return (
+        metadata.get("faq_id"),
+        fields.get("Category", ""),
+        fields.get("Subcategory", ""),
+        fields.get("Question", ""),
+        fields.get("Answer", ""),
+        metadata.get("keywords"),
+        int(metadata.get("helpful_votes", 0)),
+        int(metadata.get("views", 0)),
+    )
+
+
+def build_recommendation_row(text: str, metadata: Dict[str, Any]) -> Tuple:
+    """Build a recommendations_knowledge_base row from a ChromaDB document."""
+    fields = get_document_fields(text, metadata, _RECOMMENDATION_FIELDS)
+    name = fields.get("Name", "")
+    category = fields.get("Category", "")
+
+    return (
+        metadata.get("recommendation_id"),
+        category,
+        name,
+        fields.get("Description", ""),
+        # Generate a default address based on the name and category
+        f"{name}, {category} District",
+        float(metadata.get("distance_km", 0.0)),
+        fields.get("Price Range", ""),
+        float(metadata.get("rating", 0.0)),
+        int(metadata.get("review_count", 0)),
+        fields.get("Tags", ""),
+        metadata.get("keywords"),
+        bool(metadata.get("booking_required", False)),
+        bool(metadata.get("seasonal", False)),
     )
 
 
-async def migrate_collection(collection_name: str, table_name: str, conn):
+# Columns, row builder, upsert statement and the timestamp column the upsert
+# sets to NOW() for each target table
+_TABLE_LOADERS = {
+    "faq_knowledge_base": (
+        _FAQ_COLUMNS,
+        build_faq_row,
+        _FAQ_UPSERT_SQL,
+        "last_updated",
+    ),
+    "recommendations_knowledge_base": (
+        _RECOMMENDATION_COLUMNS,
+        build_recommendation_row,
+        _RECOMMENDATION_UPSERT_SQL,
+        "last_verified",
+    ),
+}
+
+
+async def read_pages(collection, queue: asyncio.Queue):
+    """Read a ChromaDB collection page by page and queue the pages.
+
+    Reads run in a worker thread so the event loop can keep loading
+    earlier pages into Neon. A None sentinel is queued after the last
+    page; if reading fails, the exception is queued instead.
+
+    Args:
+        collection: ChromaDB collection to read
+        queue: Receives get() results of at most PAGE_SIZE documents
+    """
+    try:
+        offset = 0
+        while True:
+            # The target tables don't store embeddings, so don't fetch them
+            page = await asyncio.to_thread(
+                collection.get,
+                limit=PAGE_SIZE,
+                offset=offset,
+                include=["documents", "metadatas"],
+            )
+            if not page["ids"]:
+                break
+            await queue.put(page)
+            offset += len(page["ids"])
+        await queue.put(None)
+    except Exception as e:
+        await queue.put(e)
+
+
+async def migrate_collection(
+    collection_name: str,
+    table_name: str,
+    conn,
+    chroma_client,
+    mode: Optional[str] = None,
+):
     """Migrate a ChromaDB collection to Neon.tech.
 
+    Documents are read PAGE_SIZE at a time, so memory use doesn't grow with
+    the collection, and the next pages are read while earlier ones load.
+
+    In "initial" mode pages are copied straight into the table, skipping
+    the staging table and conflict checks of "upsert" mode. If a copy hits
+    an existing key anyway, that page and the rest are upserted instead.
+
     Args:
         collection_name: Name of ChromaDB collection
         table_name: Name of target Neon.tech table
         conn: Database connection
+        chroma_client: ChromaDB client to read the collection from
+        mode: "initial" or "upsert"; detected from the table if not given
     """
     print(f"\nMigrating {collection_name} to {table_name}...")
 
-    # Initialize ChromaDB client
-    client = chromadb.PersistentClient(
-        path="vector_store",
-        settings=Settings(
-            anonymized_telemetry=False, allow_reset=True, is_persistent=True
-        ),
-    )
-    collection = client.get_collection(name=collection_name)
+    collection = chroma_client.get_collection(name=collection_name)
 
     if not collection:
         print(f"Collection {collection_name} not found!")
         return
 
-    # Get all documents with embeddings
-    results = collection.get(include=["documents", "metadatas", "embeddings"])
-
-    if not results or not results["ids"]:
+    total = collection.count()
+    if not total:
         print(f"No documents found in {collection_name}!")
         return
 
-    print(f"Found {len(results['ids'])} documents to migrate")
-
-    # Prepare batch insert
-    if table_name == "faq_knowledge_base":
-        # Insert FAQs
-        for i in tqdm(range(len(results["ids"])), desc=f"Migrating {collection_name}"):
-            metadata = results["metadatas"][i]
-            text = results["documents"][i]
-
-            # Extract question and answer from text
-            text_parts = text.split("\n")
-            category = next(
-                (
-                    part.replace("Category: ", "")
-                    for part in text_parts
-                    if part.startswith("Category: ")
-                ),
-                "",
-            )
-            subcategory = next(
-                (
-                    part.replace("Subcategory: ", "")
-                    for part in text_parts
-                    if part.startswith("Subcategory: ")
-                ),
-                "",
-            )
-            question = next(
-                (
-                    part.replace("Question: ", "")
-                    for part in text_parts
-                    if part.startswith("Question: ")
-                ),
-                "",
-            )
-            answer = next(
-                (
-                    part.replace("Answer: ", "")
-                    for part in text_parts
-                    if part.startswith("Answer: ")
-                ),
-                "",
-            )
+    print(f"Found {total} documents to migrate")
 
-            await conn.execute(
-                """
-                INSERT INTO faq_knowledge_base (
-                    faq_id, category, subcategory, question, answer, keywords, 
-                    last_updated, helpful_votes, views
-                ) VALUES ($1, $2, $3, $4, $5, $6, NOW(), $7, $8)
-                ON CONFLICT (faq_id) DO UPDATE SET
-                    category = EXCLUDED.category,
-                    subcategory = EXCLUDED.subcategory,
-                    question = EXCLUDED.question,
-                    answer = EXCLUDED.answer,
-                    keywords = EXCLUDED.keywords,
-                    last_updated = EXCLUDED.last_updated,
-                    helpful_votes = EXCLUDED.helpful_votes,
-                    views = EXCLUDED.views
-                """,
-                metadata.get("faq_id"),
-                category,
-                subcategory,
-                question,
-                answer,
-                metadata.get("keywords"),
-                int(metadata.get("helpful_votes", 0)),
-                int(metadata.get("views", 0)),
-            )
+    columns, build_row, upsert_sql, stamp_column = _TABLE_LOADERS[table_name]
+    if mode is None:
+        mode = await detect_mode(conn, table_name)
+    print(f"Loading {table_name} in {mode} mode")
 
-    elif table_name == "recommendations_knowledge_base":
-        # Insert recommendations
-        for i in tqdm(range(len(results["ids"])), desc=f"Migrating {collection_name}"):
-            metadata = results["metadatas"][i]
-            text = results["documents"][i]
-
-            # Extract fields from text
-            text_parts = text.split("\n")
-            name = next(
-                (
-                    part.replace("Name: ", "")
-                    for part in text_parts
-                    if part.startswith("Name: ")
-                ),
-                "",
-            )
-            category = next(
-                (
-                    part.replace("Category: ", "")
-                    for part in text_parts
-                    if part.startswith("Category: ")
-                ),
-                "",
-            )
-            description = next(
-                (
-                    part.replace("Description: ", "")
-                    for part in text_parts
-                    if part.startswith("Description: ")
-                ),
-                "",
-            )
-            tags = next(
-                (
-                    part.replace("Tags: ", "")
-                    for part in text_parts
-                    if part.startswith("Tags: ")
-                ),
-                "",
-            )
-            price_range = next(
-                (
-                    part.replace("Price Range: ", "")
-                    for part in text_parts
-                    if part.startswith("Price Range: ")
-                ),
-                "",
-            )
+    # Direct copies stamp rows with one NOW(), as the upsert statement does
+    stamp = await conn.fetchval("SELECT NOW()")
+    copy_columns = [*columns, stamp_column]
+    upsert = None
 
-            # Generate a default address based on the name and category
-            address = f"{name}, {category} District"
-
-            await conn.execute(
-                """
-                INSERT INTO recommendations_knowledge_base (
-                    recommendation_id, category, name, description, address, distance_km,
-                    price_range, rating, review_count, tags, keywords, last_verified,
-                    booking_required, seasonal
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, NOW(), $12, $13)
-                ON CONFLICT (recommendation_id) DO UPDATE SET
-                    category = EXCLUDED.category,
-                    name = EXCLUDED.name,
-                    description = EXCLUDED.description,
-                    address = EXCLUDED.address,
-                    distance_km = EXCLUDED.distance_km,
-                    price_range = EXCLUDED.price_range,
-                    rating = EXCLUDED.rating,
-                    review_count = EXCLUDED.review_count,
-                    tags = EXCLUDED.tags,
-                    keywords = EXCLUDED.keywords,
-                    last_verified = EXCLUDED.last_verified,
-                    booking_required = EXCLUDED.booking_required,
-                    seasonal = EXCLUDED.seasonal
-                """,
-                metadata.get("recommendation_id"),
-                category,
-                name,
-                description,
-                address,
-                float(metadata.get("distance_km", 0.0)),
-                price_range,
-                float(metadata.get("rating", 0.0)),
-                int(metadata.get("review_count", 0)),
-                tags,
-                metadata.get("keywords"),
-                bool(metadata.get("booking_required", False)),
-                bool(metadata.get("seasonal", False)),
-            )
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    reader = asyncio.create_task(read_pages(collection, queue))
+    try:
+        with tqdm(total=total, desc=f"Migrating {collection_name}") as progress:
+            while (page := await queue.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+
+                rows = [
+                    build_row(text, metadata)
+                    for text, metadata in zip(page["documents"], page["metadatas"])
+                ]
+                if mode == "initial":
+                    try:
+                        await copy_rows(
+                            conn,
+                            table_name,
+                            copy_columns,
+                            [(*row, stamp) for row in rows],
+                        )
+                    except asyncpg.UniqueViolationError:
+                        print(f"\n{table_name} already has some of these rows")
+                        mode = "upsert"
+                if mode == "upsert":
+                    if upsert is None:
+                        upsert = await prepare_upsert(conn, table_name, upsert_sql)
+                    await upsert_rows(conn, table_name, columns, rows, upsert)
+                progress.update(len(page["ids"]))
+    finally:
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+
+    # Refresh planner statistics, which are stale after a bulk load
+    await conn.execute(f"ANALYZE {table_name}")
 
 
 async def verify_migration(conn):
@@ -226,17 +411,36 @@ async def verify_migration(conn):
     print(f"- Recommendations migrated: {rec_count}")
 
 
-async def main():
-    """Run the migration."""
+async def main(mode: Optional[str] = None):
+    """Run the migration.
+
+    Args:
+        mode: "initial" or "upsert" for every table; detected per table
+            if not given
+    """
     try:
         # Connect to Neon.tech
         print("Connecting to Neon.tech database...")
         conn = await get_neon_connection()
 
+        # Initialize ChromaDB client once for both collections
+        chroma_client = chromadb.PersistentClient(
+            path="vector_store",
+            settings=Settings(
+                anonymized_telemetry=False, allow_reset=True, is_persistent=True
+            ),
+        )
+
         # Migrate collections
-        await migrate_collection("faqs", "faq_knowledge_base", conn)
         await migrate_collection(
-            "recommendations", "recommendations_knowledge_base", conn
+            "faqs", "faq_knowledge_base", conn, chroma_client, mode
+        )
+        await migrate_collection(
+            "recommendations",
+            "recommendations_knowledge_base",
+            conn,
+            chroma_client,
+            mode,
         )
 
         # Verify migration
@@ -253,4 +457,12 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Migrate ChromaDB data to Neon.tech")
+    parser.add_argument(
+        "--mode",
+        choices=["initial", "upsert"],
+        help="COPY into empty tables or upsert existing rows "
+        "(default: detect per table)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.mode))
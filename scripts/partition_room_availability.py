@@ -0,0 +1,204 @@
+"""Script to convert room_availability into a table partitioned by month.
+
+Availability queries and the daily extension only touch a few months, so
+with monthly range partitions on date they scan those months instead of the
+whole history. The conversion runs in one transaction and can be re-run:
+an already partitioned table is left as is.
+
+Primary key and unique constraints must include the partition key, so date
+is added to any that lack it. Tables or views that reference
+room_availability make the final DROP fail, which rolls everything back.
+"""
+
+from dotenv import load_dotenv
+from psycopg2 import sql
+from blue_horizon.db.partitions import ensure_month_partitions
+from blue_horizon.db.pool import pg_connection
+
+TABLE = "room_availability"
+OLD_TABLE = "room_availability_unpartitioned"
+PARTITION_KEY = "date"
+
+# Primary key and unique constraints, with their key columns in order
+_KEY_CONSTRAINTS_QUERY = """
+    SELECT c.conname, c.contype, array_agg(a.attname::text ORDER BY k.ord)
+    FROM pg_constraint c
+    CROSS JOIN LATERAL unnest(c.conkey) WITH ORDINALITY AS k(attnum, ord)
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+    WHERE c.conrelid = %s::regclass AND c.contype IN ('p', 'u')
+    GROUP BY c.conname, c.contype
+"""
+
+# Foreign keys, which CREATE TABLE ... LIKE doesn't copy
+_FOREIGN_KEYS_QUERY = """
+    SELECT conname, pg_get_constraintdef(oid)
+    FROM pg_constraint
+    WHERE conrelid = %s::regclass AND contype = 'f'
+"""
+
+# Indexes that don't back a constraint, with the columns of unique ones
+_INDEXES_QUERY = """
+    SELECT pg_get_indexdef(i.indexrelid), i.indisunique,
+           array(
+               SELECT a.attname::text
+               FROM pg_attribute a
+               WHERE a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+           )
+    FROM pg_index i
+    WHERE i.indrelid = %s::regclass
+      AND NOT EXISTS (
+          SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid
+      )
+"""
+
+# Sequences owned by serial columns, and identity columns
+_SERIAL_SEQUENCES_QUERY = """
+    SELECT s.relname, a.attname
+    FROM pg_depend d
+    JOIN pg_class s ON s.oid = d.objid AND s.relkind = 'S'
+    JOIN pg_attribute a ON a.attrelid = d.refobjid AND a.attnum = d.refobjsubid
+    WHERE d.refobjid = %s::regclass AND d.deptype = 'a'
+"""
+_IDENTITY_COLUMNS_QUERY = """
+    SELECT attname
+    FROM pg_attribute
+    WHERE attrelid = %s::regclass AND attidentity <> ''
+"""
+
+
+def partition_table(conn):
+    """Rebuild room_availability as a range-partitioned table, keeping its rows.
+
+    Returns:
+        bool: Whether the table was converted
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass",
+            (TABLE,),
+        )
+        if cur.fetchone() is not None:
+            return False
+
+        # Record what CREATE TABLE ... LIKE doesn't carry over
+        cur.execute(_KEY_CONSTRAINTS_QUERY, (TABLE,))
+        key_constraints = cur.fetchall()
+        cur.execute(_FOREIGN_KEYS_QUERY, (TABLE,))
+        foreign_keys = cur.fetchall()
+        cur.execute(_INDEXES_QUERY, (TABLE,))
+        indexes = cur.fetchall()
+        for indexdef, is_unique, columns in indexes:
+            if is_unique and PARTITION_KEY not in columns:
+                raise RuntimeError(
+                    f"Unique index without {PARTITION_KEY} can't be kept on a "
+                    f"partitioned table: {indexdef}"
+                )
+        cur.execute(_SERIAL_SEQUENCES_QUERY, (TABLE,))
+        serial_sequences = cur.fetchall()
+        cur.execute(_IDENTITY_COLUMNS_QUERY, (TABLE,))
+        identity_columns = [column for (column,) in cur.fetchall()]
+        cur.execute(
+            sql.SQL("SELECT MIN({key}), MAX({key}) FROM {table}").format(
+                key=sql.Identifier(PARTITION_KEY), table=sql.Identifier(TABLE)
+            )
+        )
+        first_date, last_date = cur.fetchone()
+
+        # Create the partitioned table under the original name
+        cur.execute(
+            sql.SQL("ALTER TABLE {} RENAME TO {}").format(
+                sql.Identifier(TABLE), sql.Identifier(OLD_TABLE)
+            )
+        )
+        cur.execute(
+            sql.SQL(
+                "CREATE TABLE {table} "
+                "(LIKE {old} INCLUDING ALL EXCLUDING INDEXES) "
+                "PARTITION BY RANGE ({key})"
+            ).format(
+                table=sql.Identifier(TABLE),
+                old=sql.Identifier(OLD_TABLE),
+                key=sql.Identifier(PARTITION_KEY),
+            )
+        )
+        if first_date is not None:
+            ensure_month_partitions(conn, TABLE, first_date, last_date)
+
+        # Copy the rows, keeping generated ids as they are
+        print("Copying rows into monthly partitions...")
+        cur.execute(
+            sql.SQL("INSERT INTO {} OVERRIDING SYSTEM VALUE SELECT * FROM {}").format(
+                sql.Identifier(TABLE), sql.Identifier(OLD_TABLE)
+            )
+        )
+        print(f"Copied {cur.rowcount} rows")
+
+        # Hand serial sequences to the new table so dropping the old one
+        # keeps them, and continue identity sequences after the copied ids
+        for sequence, column in serial_sequences:
+            cur.execute(
+                sql.SQL("ALTER SEQUENCE {} OWNED BY {}.{}").format(
+                    sql.Identifier(sequence),
+                    sql.Identifier(TABLE),
+                    sql.Identifier(column),
+                )
+            )
+        for column in identity_columns:
+            cur.execute(
+                sql.SQL(
+                    "SELECT setval(pg_get_serial_sequence(%s, %s), "
+                    "COALESCE(MAX({column}), 1), MAX({column}) IS NOT NULL) "
+                    "FROM {table}"
+                ).format(column=sql.Identifier(column), table=sql.Identifier(TABLE)),
+                (TABLE, column),
+            )
+
+        # Drop the old table first, so its constraint and index names are free
+        cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(OLD_TABLE)))
+
+        print("Recreating constraints and indexes...")
+        for name, contype, columns in key_constraints:
+            if PARTITION_KEY not in columns:
+                columns = [*columns, PARTITION_KEY]
+            cur.execute(
+                sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} {} ({})").format(
+                    sql.Identifier(TABLE),
+                    sql.Identifier(name),
+                    sql.SQL("PRIMARY KEY" if contype == "p" else "UNIQUE"),
+                    sql.SQL(", ").join(map(sql.Identifier, columns)),
+                )
+            )
+        for name, definition in foreign_keys:
+            cur.execute(
+                sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} {}").format(
+                    sql.Identifier(TABLE), sql.Identifier(name), sql.SQL(definition)
+                )
+            )
+        # The saved definitions name the table, which the new one now has
+        for indexdef, _, _ in indexes:
+            cur.execute(indexdef)
+
+        cur.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(TABLE)))
+    return True
+
+
+def main():
+    # Load environment variables
+    load_dotenv()
+
+    try:
+        # Connect to the database; the whole conversion is one transaction
+        print("Connecting to Neon.tech database...")
+        with pg_connection() as conn:
+            if partition_table(conn):
+                print("room_availability is now partitioned by month!")
+            else:
+                print("room_availability is already partitioned")
+
+    except Exception as e:
+        print(f"Error partitioning room availability: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -12,27 +12,86 @@ from dotenv import load_dotenv
 from openai import OpenAI
 from sentence_transformers import SentenceTransformer
 
+from blue_horizon.db.config import get_db_config
+
 # Load environment variables
 load_dotenv(override=True)
 
+# Tables the viewer can browse; table names are only ever taken from here
+TABLES = ["faq_knowledge_base", "recommendations_knowledge_base", "embeddings"]
+
+# HNSW graph parameters for the embedding indexes, as in check_neon_db.py
+_VECTOR_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS {table}_embedding_idx
+    ON {table} USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64)
+"""
+
+# Sample rows fetched from the server and rendered at a time
+PREVIEW_CHUNK_SIZE = 1000
+
+# Candidates the HNSW search keeps per result; pgvector's default is 40
+_EF_SEARCH_PER_RESULT = 8
 
+
+@st.cache_resource
 def get_db_connection():
-    """Create database connection."""
-    db_url = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-    return create_engine(db_url)
+    """Create database connection, shared across Streamlit reruns."""
+    return create_engine(get_db_config().url)
+
+
+@st.cache_resource
+def get_openai_client() -> OpenAI:
+    """Create the OpenAI client once and reuse it across Streamlit reruns."""
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
 
+@st.cache_resource
+def get_sentence_transformer() -> SentenceTransformer:
+    """Load the SentenceTransformer model once and reuse it across reruns."""
+    return SentenceTransformer("all-MiniLM-L6-v2")
 
-def get_embedding(query: str, use_openai: bool = True) -> List[float]:
-    """Get embedding for query text."""
+
+@st.cache_data(ttl=600)
+def get_embeddings(queries: List[str], use_openai: bool = True) -> List[List[float]]:
+    """Get embeddings for query texts in one batch, cached for repeated searches."""
     if use_openai:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = get_openai_client()
         response = client.embeddings.create(
-            model="text-embedding-3-small", input=query, encoding_format="float"
+            model="text-embedding-3-small", input=queries, encoding_format="float"
         )
-        return response.data[0].embedding
+        return [item.embedding for item in response.data]
     else:
-        model = SentenceTransformer("all-MiniLM-L6-v2")
-        return model.encode(query).tolist()
+        model = get_sentence_transformer()
+        return model.encode(queries, batch_size=32, convert_to_numpy=True).tolist()
+
+
+@st.cache_resource
+def ensure_vector_index(table: str) -> None:
+    """Create the table's HNSW index if missing, once per table per process.
+
+    Without it, every similarity search scans the whole embedding column.
+    """
+    with get_db_connection().begin() as conn:
+        conn.execute(text(_VECTOR_INDEX_SQL.format(table=table)))
+
+
+@st.cache_data
+def get_display_columns(table: str) -> List[str]:
+    """Get a table's column names, leaving out the embedding vector."""
+    with get_db_connection().connect() as conn:
+        return conn.execute(
+            text(
+                """
+                SELECT column_name
+                FROM information_schema.columns
+                WHERE table_schema = 'public' AND table_name = :table
+                  AND column_name <> 'embedding'
+                ORDER BY ordinal_position
+                """
+            ),
+            {"table": table},
+        ).scalars().all()
 
 
 def main():
@@ -43,11 +102,19 @@ def main():
     engine = get_db_connection()
 
     # Get available tables
-    tables = ["faq_knowledge_base", "recommendations_knowledge_base", "embeddings"]
-    selected_table = st.selectbox("Select Table", tables)
+    selected_table = st.selectbox("Select Table", TABLES)
 
-    if selected_table:
+    if selected_table in TABLES:
         try:
+            # No columns means the table doesn't exist yet, and there would be
+            # nothing to select for the sample
+            display_columns = get_display_columns(selected_table)
+            if not display_columns:
+                # Don't keep the empty result, so the table shows up once created
+                get_display_columns.clear(selected_table)
+                st.error(f"Table {selected_table} not found")
+                return
+
             # Display table info
             with engine.connect() as conn:
                 # Get row count
@@ -56,18 +123,27 @@ def main():
                 ).scalar()
                 st.metric("Number of Records", count)
 
-                # Display sample data
-                query = f"SELECT * FROM {selected_table} LIMIT 5"
-                df = pd.read_sql(query, conn)
-
-                with st.expander("Sample Data"):
-                    # Remove embedding column for display
-                    display_df = (
-                        df.drop("embedding", axis=1)
-                        if "embedding" in df.columns
-                        else df
-                    )
-                    st.dataframe(display_df)
+            # Display sample data, without fetching the embedding vectors
+            sample_size = st.slider("Sample rows", 5, 5000, 5)
+            columns = ", ".join(f'"{column}"' for column in display_columns)
+            query = text(f"SELECT {columns} FROM {selected_table} LIMIT :n")
+
+            # Stream the sample through a server-side cursor, so large samples
+            # aren't buffered by the driver before the first rows are shown
+            with engine.connect().execution_options(
+                stream_results=True, yield_per=PREVIEW_CHUNK_SIZE
+            ) as conn, st.expander("Sample Data"):
+                table = None
+                for chunk in pd.read_sql(
+                    query,
+                    conn,
+                    params={"n": sample_size},
+                    chunksize=PREVIEW_CHUNK_SIZE,
+                ):
+                    if table is None:
+                        table = st.dataframe(chunk)
+                    else:
+                        table.add_rows(chunk)
 
             # Search functionality
             st.subheader("Vector Search")
@@ -80,10 +156,18 @@ def main():
 
             if search_query:
                 with st.spinner("Generating embedding..."):
-                    query_embedding = get_embedding(search_query, use_openai)
+                    query_embedding = get_embeddings([search_query], use_openai)[0]
 
                 # Perform vector search
+                ensure_vector_index(selected_table)
                 with engine.connect() as conn:
+                    # Widen the HNSW candidate list for larger result counts,
+                    # for this transaction only
+                    ef_search = max(40, n_results * _EF_SEARCH_PER_RESULT)
+                    conn.execute(
+                        text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+                        {"ef": str(ef_search)},
+                    )
                     if selected_table == "faq_knowledge_base":
                         query = text(
                             """
@@ -119,17 +203,30 @@ def main():
                         query, {"embedding": query_embedding, "n": n_results}
                     )
 
-                    # Display results
-                    st.subheader("Search Results")
-                    for i, row in enumerate(results, 1):
-                        similarity = row.similarity
-                        with st.expander(f"Result {i} (Similarity: {similarity:.4f})"):
-                            for col, val in row._mapping.items():
-                                if col != "similarity":
-                                    if isinstance(val, (dict, list)):
-                                        st.json(val)
-                                    else:
-                                        st.write(f"**{col}:** {val}")
+                    results_df = pd.DataFrame(
+                        results.fetchall(), columns=list(results.keys())
+                    )
+
+                # Display results as one table, with details for a chosen row
+                st.subheader("Search Results")
+                if not results_df.empty:
+                    st.dataframe(results_df.style.format({"similarity": "{:.4f}"}))
+                    selected = st.selectbox(
+                        "Show result",
+                        results_df.index,
+                        format_func=lambda i: (
+                            f"Result {i + 1} (Similarity: "
+                            f"{results_df.at[i, 'similarity']:.4f})"
+                        ),
+                    )
+                    with st.expander("Result details", expanded=True):
+                        row = results_df.loc[selected]
+                        for col, val in row.items():
+                            if col != "similarity":
+                                if isinstance(val, (dict, list)):
+                                    st.json(val)
+                                else:
+                                    st.write(f"**{col}:** {val}")
 
         except Exception as e:
             st.error(f"Error accessing table: {str(e)}")
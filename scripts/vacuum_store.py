@@ -1,6 +1,7 @@
 """Script to vacuum ChromaDB database."""
 
 import subprocess
+import threading
 from pathlib import Path
 
 from blue_horizon.utils.logger import log, LogLevel
@@ -17,7 +18,7 @@ def vacuum_chroma_db():
 
     log(f"Vacuuming ChromaDB at: {persist_dir}", LogLevel.ON)
     try:
-        result = subprocess.run(
+        with subprocess.Popen(
             [
                 "chroma",
                 "utils",
@@ -26,17 +27,32 @@ def vacuum_chroma_db():
                 "--path",
                 str(persist_dir.absolute()),
             ],
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            check=True,
-        )
-        log(f"Vacuum output: {result.stdout}", LogLevel.ON)
-        if result.stderr:
-            log(f"Vacuum warnings: {result.stderr}", LogLevel.WARNING)
+            bufsize=1,
+        ) as proc:
+            # Drain stderr in the background so a full pipe can't stall vacuum
+            stderr_lines = []
+            stderr_reader = threading.Thread(
+                target=lambda: stderr_lines.extend(proc.stderr), daemon=True
+            )
+            stderr_reader.start()
+
+            # Log output as it is produced instead of buffering all of it
+            for line in proc.stdout:
+                log(f"Vacuum output: {line.rstrip()}", LogLevel.ON)
+
+            returncode = proc.wait()
+            stderr_reader.join()
+
+        stderr = "".join(stderr_lines)
+        if returncode != 0:
+            log(f"Error during vacuum: {stderr}", LogLevel.ERROR)
+            return False
+        if stderr:
+            log(f"Vacuum warnings: {stderr}", LogLevel.WARNING)
         return True
-    except subprocess.CalledProcessError as e:
-        log(f"Error during vacuum: {e.stderr}", LogLevel.ERROR)
-        return False
     except (FileNotFoundError, PermissionError, OSError) as e:
         log(f"File system error during vacuum: {e}", LogLevel.ERROR)
         return False
@@ -1,24 +1,28 @@
-import os
 import asyncio
 import asyncpg
 from sqlalchemy import create_engine
 from dotenv import load_dotenv
+from blue_horizon.db.config import get_db_config, get_redis_config
 from blue_horizon.services.nl2sql_service import NL2SQLService
 
+# One line of the results table; price is padded after its dollar sign
+_ROW_TEMPLATE = "{name:<30} {location:<25} {category:<20} ${price:<9.2f}"
+
 
 async def test_amenities_query():
     # Load environment variables
     load_dotenv()
 
     # Create database URL for Neon.tech
-    db_url = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+    db_url = get_db_config().url
+    redis_config = get_redis_config()
 
     print("\nInitializing NL2SQLService with Neon.tech connection...")
     service = NL2SQLService(
         db_url=db_url,
-        redis_host=os.getenv("REMOTE_REDIS_HOST"),
-        redis_port=int(os.getenv("REMOTE_REDIS_PORT", "6379")),
-        redis_password=os.getenv("REMOTE_REDIS_PASSWORD"),
+        redis_host=redis_config.host,
+        redis_port=redis_config.port,
+        redis_password=redis_config.password,
     )
 
     # Test query for amenities
@@ -34,15 +38,20 @@ async def test_amenities_query():
     # Print the results in a formatted way
     print("\nResults:")
     if "raw_result" in result["metadata"]:
+        rows = [
+            {
+                "name": item.get("DISTINCT name", item.get("name", "N/A")),
+                "location": item.get("location", "N/A"),
+                "category": item.get("category", "N/A"),
+                "price": item.get("price", 0),
+            }
+            for item in result["metadata"]["raw_result"]
+        ]
         print(f"{'Name':<30} {'Location':<25} {'Category':<20} {'Price':<10}")
         print("-" * 85)
-        for item in result["metadata"]["raw_result"]:
-            name = item.get("DISTINCT name", item.get("name", "N/A"))
-            location = item.get("location", "N/A")
-            category = item.get("category", "N/A")
-            price = f"${item.get('price', 0):.2f}"
-            print(f"{name:<30} {location:<25} {category:<20} {price:<10}")
-        print(f"\nTotal amenities found: {len(result['metadata']['raw_result'])}")
+        # Format every row with one template and write the table in one call
+        print("\n".join(_ROW_TEMPLATE.format_map(row) for row in rows))
+        print(f"\nTotal amenities found: {len(rows)}")
     else:
         print(result["results"])
 
@@ -1,8 +1,9 @@
 import redis
-import os
 from datetime import datetime
 from dotenv import load_dotenv
 
+from blue_horizon.db.config import get_redis_config
+
 # Load environment variables
 load_dotenv()
 
@@ -16,9 +17,10 @@ def test_redis_connection():
     print("Testing Redis connection...")
 
     # Redis Cloud connection details
-    redis_host = os.getenv("REMOTE_REDIS_HOST")
-    redis_port = os.getenv("REMOTE_REDIS_PORT")
-    redis_password = os.getenv("REMOTE_REDIS_PASSWORD")
+    redis_config = get_redis_config()
+    redis_host = redis_config.host
+    redis_port = redis_config.port
+    redis_password = redis_config.password
 
     if not redis_password:
         raise ValueError("Redis password not found in .env file")
@@ -26,25 +28,33 @@ def test_redis_connection():
     print(f"Connecting to Redis at {redis_host}:{redis_port}")
 
     try:
-        # Connect with minimal configuration
+        # Connect with minimal configuration, keeping the socket alive
         r = redis.Redis(
             host=redis_host,
             port=redis_port,
             password=redis_password,
             decode_responses=True,
+            socket_keepalive=True,
+            health_check_interval=30,
         )
 
+        # Send every command in a single round trip
+        test_key = "test:connection"
+        test_value = f"Connection test at {datetime.now()}"
+        with r.pipeline(transaction=False) as pipe:
+            pipe.ping()
+            pipe.set(test_key, test_value)
+            pipe.get(test_key)
+            pipe.delete(test_key)
+            pipe.get(test_key)
+            result, _, retrieved, _, deleted_value = pipe.execute()
+
         # Test 1: Basic connection
         print("\n1. Testing connection...")
-        result = r.ping()
         print(f"Connection test: {'✅ Passed' if result else '❌ Failed'}")
 
         # Test 2: Set and get
         print("\n2. Testing set/get operations...")
-        test_key = "test:connection"
-        test_value = f"Connection test at {datetime.now()}"
-        r.set(test_key, test_value)
-        retrieved = r.get(test_key)
         print(
             f"Set/Get test: {'✅ Passed' if retrieved == test_value else '❌ Failed'}"
         )
@@ -52,8 +62,6 @@ def test_redis_connection():
 
         # Test 3: Delete
         print("\n3. Testing delete operation...")
-        r.delete(test_key)
-        deleted_value = r.get(test_key)
         print(f"Delete test: {'✅ Passed' if deleted_value is None else '❌ Failed'}")
 
         print("\n✨ All tests completed successfully!")
@@ -0,0 +1,66 @@
+"""Tests for the agent pool."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from blue_horizon.agents.base_agent import BaseConciergAgent
+from blue_horizon.agents.pool import AgentPool
+
+AGENT_KWARGS = {
+    "name": "test_agent",
+    "description": "Agent used in tests",
+    "instructions": "Answer briefly.",
+    "llm_config": False,
+}
+
+
+def test_released_agent_forgets_cached_responses():
+    """Test that an agent handed back to the pool keeps no cached responses."""
+    pool = AgentPool()
+    agent = pool.acquire(BaseConciergAgent, **AGENT_KWARGS)
+
+    with patch.object(
+        BaseConciergAgent,
+        "generate_response",
+        AsyncMock(return_value="Check-in is at 3 PM."),
+    ):
+        response = asyncio.run(agent._process_message("When is check-in?"))
+    assert response == "Check-in is at 3 PM."
+    assert agent._response_cache
+
+    pool.release(agent)
+    same_agent = pool.acquire(BaseConciergAgent, **AGENT_KWARGS)
+
+    assert same_agent is agent
+    assert not same_agent._response_cache
+    assert not same_agent.conversation_memory
+
+
+def test_agent_is_not_handed_out_twice():
+    """Test that a checked-out agent is never given to a second caller."""
+    pool = AgentPool()
+    first = pool.acquire(BaseConciergAgent, **AGENT_KWARGS)
+    second = pool.acquire(BaseConciergAgent, **AGENT_KWARGS)
+    assert first is not second
+
+    pool.release(first)
+    pool.release(second)
+    assert {
+        pool.acquire(BaseConciergAgent, **AGENT_KWARGS),
+        pool.acquire(BaseConciergAgent, **AGENT_KWARGS),
+    } == {first, second}
+
+
+def test_double_release_is_rejected():
+    """Test that releasing an agent twice doesn't queue it twice."""
+    pool = AgentPool()
+    agent = pool.acquire(BaseConciergAgent, **AGENT_KWARGS)
+    pool.release(agent)
+
+    with pytest.raises(ValueError, match="already released"):
+        pool.release(agent)
+
+    assert pool.acquire(BaseConciergAgent, **AGENT_KWARGS) is agent
+    assert pool.acquire(BaseConciergAgent, **AGENT_KWARGS) is not agent
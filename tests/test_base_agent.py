@@ -0,0 +1,89 @@
+"""Tests for the base concierge agent's response cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from blue_horizon.agents import base_agent
+from blue_horizon.agents.base_agent import BaseConciergAgent
+
+
+def make_agent() -> BaseConciergAgent:
+    """Create an agent that never calls an LLM."""
+    return BaseConciergAgent(
+        name="test_agent",
+        description="Agent used in tests",
+        instructions="Answer briefly.",
+        llm_config=False,
+    )
+
+
+def test_repeated_message_uses_cache():
+    """Test that a standalone message is answered from the cache."""
+    agent = make_agent()
+    generate = AsyncMock(return_value="The pool opens at 7 AM.")
+
+    with patch.object(BaseConciergAgent, "generate_response", generate):
+        asyncio.run(agent._process_message("When does the pool open?"))
+        agent.conversation_memory.clear()
+        response = asyncio.run(agent._process_message("when does the pool open"))
+
+    assert response == "The pool opens at 7 AM."
+    assert generate.await_count == 1
+
+
+def test_message_with_relevant_memory_skips_cache():
+    """Test that context-dependent turns are always sent to the LLM."""
+    agent = make_agent()
+    generate = AsyncMock(side_effect=["Booked the spa.", "Booked the restaurant."])
+
+    with patch.object(BaseConciergAgent, "generate_response", generate):
+        asyncio.run(agent._process_message("book it"))
+        response = asyncio.run(agent._process_message("book it"))
+
+    assert response == "Booked the restaurant."
+    assert generate.await_count == 2
+
+
+def test_expired_response_is_regenerated():
+    """Test that cached responses are not reused after their TTL."""
+    agent = make_agent()
+    generate = AsyncMock(side_effect=["Sunny today.", "Rain this afternoon."])
+
+    with patch.object(BaseConciergAgent, "generate_response", generate):
+        with patch.object(base_agent, "_RESPONSE_CACHE_TTL", 0.0):
+            asyncio.run(agent._process_message("What's the weather?"))
+        agent.conversation_memory.clear()
+        response = asyncio.run(agent._process_message("What's the weather?"))
+
+    assert response == "Rain this afternoon."
+    assert generate.await_count == 2
+
+
+def test_batch_returns_responses_in_agent_order():
+    """Test that each agent answers its own message, in order."""
+    agents = [make_agent(), make_agent()]
+
+    async def echo(self, message, context):
+        return f"{id(self)}: {message}"
+
+    with patch.object(BaseConciergAgent, "generate_response", echo):
+        responses = asyncio.run(
+            BaseConciergAgent.generate_responses_batch(agents, ["spa", "dinner"])
+        )
+
+    assert responses == [f"{id(agents[0])}: spa", f"{id(agents[1])}: dinner"]
+
+
+def test_batch_rejects_mismatched_messages():
+    """Test that a message count different from the agent count is an error."""
+    generate = AsyncMock(return_value="unused")
+
+    with patch.object(BaseConciergAgent, "generate_response", generate):
+        with pytest.raises(ValueError):
+            asyncio.run(
+                BaseConciergAgent.generate_responses_batch([make_agent()], [])
+            )
+
+    generate.assert_not_awaited()
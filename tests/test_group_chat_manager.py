@@ -0,0 +1,62 @@
+"""Tests for group chat message routing."""
+
+from types import SimpleNamespace
+
+from blue_horizon.agents.group_chat_manager import GroupChatManager, _tokenize
+
+
+def make_agent(name, can_handle):
+    """Create a stand-in agent advertising the given capabilities."""
+    return SimpleNamespace(
+        name=name, get_capabilities=lambda: {"can_handle": can_handle}
+    )
+
+
+def make_manager(agents):
+    """Create a manager with its routing index built from the given agents."""
+    manager = GroupChatManager.__new__(GroupChatManager)
+    # groupchat is a read-only property backed by _groupchat
+    manager._groupchat = SimpleNamespace(agents=agents)
+    manager.agent_capabilities = {}
+    manager._keyword_index = {}
+    manager._agent_keyword_sets = {}
+    manager._register_agent_capabilities()
+    return manager
+
+
+AGENTS = [
+    make_agent(
+        "CustomerServiceAgent",
+        ("customer_inquiries", "complaint_resolution", "service_recovery"),
+    ),
+    make_agent("BookingAgent", ("room_bookings", "restaurant_reservations")),
+    make_agent(
+        "WeatherAgent", ("Current weather conditions", "Temperature information")
+    ),
+]
+
+
+def route(message):
+    """Route a message and return the chosen agent's name."""
+    agent = make_manager(AGENTS)._route_user_request(message, AGENTS)
+    return agent.name
+
+
+def test_routes_plural_requests():
+    """Test that plural words match singular or plural capability keywords."""
+    assert route("I need two rooms for the weekend") == "BookingAgent"
+    assert route("What are the temperatures this week?") == "WeatherAgent"
+    assert route("Do you have any reservations left tonight?") == "BookingAgent"
+
+
+def test_routes_singular_requests():
+    """Test that singular words match plural capability keywords."""
+    assert route("I'd like to make a booking") == "BookingAgent"
+    assert route("I have a complaint about the noise") == "CustomerServiceAgent"
+
+
+def test_ignores_substring_matches():
+    """Test that a keyword inside a longer word does not count as a match."""
+    manager = make_manager(AGENTS)
+    tokens = _tokenize("My roommate is visiting")
+    assert manager._calculate_agent_suitability(tokens, "BookingAgent") == 0
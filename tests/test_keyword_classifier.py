@@ -0,0 +1,23 @@
+"""Tests for keyword-based request classification."""
+
+from blue_horizon.agents.keyword_classifier import KeywordClassifier
+
+
+def test_earliest_category_wins_when_several_match():
+    classifier = KeywordClassifier(
+        {"booking": ["reserve"], "dining": ["dinner"]}, default="general"
+    )
+
+    assert classifier.classify("Reserve a table for dinner") == "booking"
+    assert classifier.classify("What's for dinner?") == "dining"
+    assert classifier.classify("Hello there") == "general"
+
+
+def test_keyword_under_two_categories_keeps_the_earliest():
+    classifier = KeywordClassifier(
+        {"booking": ["table", "reserve"], "dining": ["Table", "menu"]},
+        default="general",
+    )
+
+    assert classifier.classify("Is there a table free?") == "booking"
+    assert classifier.classify("Show me the menu") == "dining"